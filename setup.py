@@ -31,7 +31,6 @@ setup(
     ],
     python_requires=">=3.6",
     install_requires=[
-        "beautifulsoup4>=4.13.3",
         "requests>=2.32.3",
         "lxml>=6.0.2",
     ],
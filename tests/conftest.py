@@ -0,0 +1,19 @@
+import shutil
+
+import pytest
+
+from uaforge.core.database import DEFAULT_DB_PATH
+from uaforge.core.user_agent import UserAgentGenerator
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    # A private copy, so tests never write to the packaged database.
+    path = tmp_path / "useragent.db"
+    shutil.copyfile(DEFAULT_DB_PATH, path)
+    return str(path)
+
+
+@pytest.fixture
+def generator(db_path):
+    return UserAgentGenerator(db_path, seed=1234)
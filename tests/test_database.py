@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+from uaforge.core.database import DEFAULT_DB_PATH, SCHEMA_VERSION, Database, _create_base_tables
+
+
+@pytest.fixture
+def legacy_path(tmp_path):
+    # A pre-versioning database: schema 1 tables, user_version 0.
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    _create_base_tables(conn)
+    conn.executemany("INSERT INTO chrome_versions VALUES (?, ?, ?)", [
+        ("Chrome/120.0.6099.109", "2023-12-12", "2024-01-01T00:00:00"),
+        ("Chrome/9.0.597.84", "2011-02-03T05:30:52.112Z", "2024-01-01T00:00:00"),
+    ])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_packaged_database_ships_at_latest_schema():
+    with Database(readonly=True) as db:
+        assert db.schema_version == SCHEMA_VERSION
+
+
+def test_migrates_legacy_database(legacy_path):
+    with Database(legacy_path) as db:
+        assert db.schema_version == SCHEMA_VERSION
+        versions, rows = db.get_chrome_vers()
+        assert sorted(versions) == ["Chrome/120.0.6099.109", "Chrome/9.0.597.84"]
+        # Numeric ordering, not text ordering, and ISO release dates.
+        assert db.get_latest_versions("chrome", 2) == ["Chrome/120.0.6099.109", "Chrome/9.0.597.84"]
+        assert db.get_max_major("chrome") == 120
+        assert dict((version, date) for version, date, _ in rows)["Chrome/9.0.597.84"] == "2011-02-03"
+
+
+def test_migration_runs_once(legacy_path):
+    Database(legacy_path).close()
+    with Database(legacy_path) as db:
+        conn = db.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM versions").fetchone()[0] == 2
+        assert conn.execute("SELECT type FROM sqlite_master WHERE name = 'chrome_versions'").fetchone()[0] == "view"
+
+
+def test_readonly_open_leaves_legacy_database_alone(legacy_path):
+    with Database(legacy_path, readonly=True) as db:
+        assert db.schema_version == 0
+        assert db.get_latest_versions("chrome", 1) == ["Chrome/120.0.6099.109"]
+
+
+def test_upsert_only_rewrites_changed_rows(db_path):
+    with Database(db_path) as db:
+        db.upsert_versions("chrome_versions", [("Chrome/999.0.0.1", "2030-01-01", "t1")])
+        db.upsert_versions("chrome_versions", [("Chrome/999.0.0.1", "2030-01-01", "t2")])
+        rows = {version: last_updated for version, _, last_updated in db.get_chrome_vers()[1]}
+        assert rows["Chrome/999.0.0.1"] == "t1"
+        with pytest.raises(ValueError):
+            db.upsert_versions("safari_versions", [])
+
+
+def test_wal_is_opt_in_and_never_used_for_packaged_database(db_path):
+    def journal_mode(path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            conn.close()
+
+    with Database(db_path) as db:
+        db.get_connection()
+    assert journal_mode(db_path) == "delete"
+    with Database(db_path, wal=True) as db:
+        db.get_connection()
+    assert journal_mode(db_path) == "wal"
+    assert not Database(str(DEFAULT_DB_PATH), readonly=True, wal=True).wal
@@ -0,0 +1,31 @@
+import pytest
+
+from uaforge.core.http import CircuitBreaker, CircuitOpenError, DeadlineExceeded, HttpClient
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure("chrome")
+    breaker.before_request("chrome")
+    breaker.record_failure("chrome")
+    assert breaker.is_open("chrome")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("chrome")
+    breaker.before_request("firefox")
+
+
+def test_success_closes_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure("opera")
+    breaker.before_request("opera")  # Half-open trial after the reset timeout.
+    breaker.record_success("opera")
+    assert not breaker.is_open("opera")
+
+
+def test_deadline_can_be_cleared():
+    client = HttpClient()
+    client.set_deadline(0)
+    with pytest.raises(DeadlineExceeded):
+        client._remaining()
+    client.set_deadline(None)
+    assert client._remaining() is None
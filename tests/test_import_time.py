@@ -0,0 +1,11 @@
+from uaforge.bench import IMPORT_BUDGET_MS, measure_import_time
+
+
+def test_import_stays_within_budget():
+    result = measure_import_time("uaforge", runs=3)
+    assert result["best_ms"] <= IMPORT_BUDGET_MS, result
+
+
+def test_import_does_not_load_http_stack():
+    result = measure_import_time("uaforge", runs=1)
+    assert result["heavy_modules"] == []
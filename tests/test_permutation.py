@@ -0,0 +1,28 @@
+import pytest
+
+from uaforge.core.permutation import FeistelPermutation
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1000, 4097])
+def test_is_a_bijection(size):
+    assert sorted(FeistelPermutation(size, seed=7)) == list(range(size))
+
+
+def test_same_seed_same_order():
+    assert list(FeistelPermutation(500, seed=3)) == list(FeistelPermutation(500, seed=3))
+
+
+def test_different_seeds_differ():
+    assert list(FeistelPermutation(500, seed=3)) != list(FeistelPermutation(500, seed=4))
+
+
+def test_indexing_matches_iteration():
+    permutation = FeistelPermutation(300, seed=11)
+    assert [permutation[index] for index in range(len(permutation))] == list(permutation)
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        FeistelPermutation(0, seed=1)
+    with pytest.raises(IndexError):
+        FeistelPermutation(10, seed=1)[10]
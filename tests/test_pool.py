@@ -0,0 +1,65 @@
+import pytest
+
+from uaforge.core.pool import PoolExhaustedError, UserAgentPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fills_with_distinct_agents(generator):
+    pool = UserAgentPool(50, generator)
+    assert len(pool) == 50
+    assert pool.stats() == {"size": 50, "in_use": 0, "cooling": 0, "ready": 50, "retired": 0}
+
+
+def test_rotates_least_recently_used(generator):
+    pool = UserAgentPool(3, generator)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() != first
+
+
+def test_cooldown_follows_the_clock(generator):
+    clock = FakeClock()
+    pool = UserAgentPool(1, generator, cooldown=30, clock=clock)
+    user_agent = pool.acquire()
+    pool.release(user_agent)
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire()
+    clock.now = 30
+    assert pool.acquire() == user_agent
+
+
+def test_max_uses_retires_and_replaces(generator):
+    pool = UserAgentPool(2, generator, max_uses=1)
+    user_agent = pool.acquire()
+    pool.release(user_agent)
+    assert user_agent not in pool
+    assert len(pool) == 2
+    assert pool.stats()["retired"] == 1
+
+
+def test_mark_bad_inside_lease(generator):
+    pool = UserAgentPool(2, generator)
+    with pool.lease() as user_agent:
+        pool.mark_bad(user_agent)
+    assert user_agent not in pool
+    assert pool.uses(user_agent) == 0
+    assert pool.stats()["in_use"] == 0
+
+
+def test_release_rejects_unknown_agent(generator):
+    pool = UserAgentPool(1, generator)
+    with pytest.raises(ValueError):
+        pool.release("Mozilla/5.0 (unknown)")
+
+
+@pytest.mark.parametrize("kwargs", [{"size": 0}, {"size": 1, "cooldown": -1}, {"size": 1, "max_uses": 0}])
+def test_rejects_bad_arguments(generator, kwargs):
+    with pytest.raises(ValueError):
+        UserAgentPool(generator=generator, **kwargs)
@@ -0,0 +1,48 @@
+import random
+from collections import Counter
+
+import pytest
+
+from uaforge.core.sampling import AliasTable, Weights
+from uaforge.core.user_agent import UserAgentGenerator
+
+
+def test_alias_table_follows_weights():
+    table = AliasTable([1, 2, 7])
+    rng = random.Random(5)
+    counts = Counter(table.sample(rng) for _ in range(100_000))
+    for index, expected in enumerate([0.1, 0.2, 0.7]):
+        assert counts[index] / 100_000 == pytest.approx(expected, abs=0.01)
+
+
+def test_alias_table_never_draws_zero_weights():
+    table = AliasTable([0, 3, 0, 1])
+    rng = random.Random(1)
+    assert {table.sample(rng) for _ in range(10_000)} == {1, 3}
+
+
+@pytest.mark.parametrize("weights", [[0, 0], [1, -1]])
+def test_alias_table_rejects_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_zero_weighted_browser_is_unreachable(db_path):
+    generator = UserAgentGenerator(db_path, seed=1, weights=Weights(browsers={"Opera": 0}))
+    assert generator.cardinality() == generator.cardinality("Chrome") + generator.cardinality("Firefox")
+    with pytest.raises(ValueError):
+        generator.get_list(generator.cardinality() + 1)
+
+
+def test_unique_iteration_terminates_with_zero_weighted_platform(db_path):
+    generator = UserAgentGenerator(db_path, seed=1, weights=Weights(platforms={"Windows": 0}))
+    capacity = generator.cardinality("Chrome")
+    agents = list(generator.iter_useragents("Chrome", unique=True, limit=capacity))
+    assert len(set(agents)) == capacity
+    assert not any("Windows" in agent for agent in agents)
+
+
+def test_get_list_is_unique_and_sized(generator):
+    for count in (0, 10, 5_000, 20_000):
+        agents = generator.get_list(count)
+        assert len(agents) == len(set(agents)) == count
@@ -1,19 +1,50 @@
 from .core.user_agent import UserAgentGenerator
 from .core.database import Database
-from .core.version_fetcher import VersionFetcher
-from .core.version_updater import VersionUpdater
+from .core.catalog import Catalog
+from .core.sampling import Weights
+from .core.metrics import metrics
+from .core.shared import SharedUserAgentGenerator, shared_generator
+from .core.pool import UserAgentPool, PoolExhaustedError
 
 __version__ = "1.1.1"
 __author__ = "bolgac"
 __email__ = "bytearchsoft@gmail.com"
 
-__all__ = ['UserAgentGenerator', 'Database', 'VersionFetcher', 'VersionUpdater']
+__all__ = ['UserAgentGenerator', 'SharedUserAgentGenerator', 'shared_generator', 'Database', 'Catalog', 'Weights',
+           'UserAgentPool', 'PoolExhaustedError', 'metrics', 'VersionFetcher', 'VersionUpdater',
+           'AsyncUserAgentGenerator', 'AsyncVersionUpdater', 'generate_bulk', 'write_bulk', 'cli_main']
+
+# The fetcher/updater stack pulls in requests and lxml, and the async API asyncio.
+# Generation does not need any of it, so these names are resolved on first access
+# instead of at import time.
+_LAZY_ATTRIBUTES = {
+    'VersionFetcher': ('.core.version_fetcher', 'VersionFetcher'),
+    'VersionUpdater': ('.core.version_updater', 'VersionUpdater'),
+    'AsyncUserAgentGenerator': ('.core.aio', 'AsyncUserAgentGenerator'),
+    'AsyncVersionUpdater': ('.core.aio', 'AsyncVersionUpdater'),
+    'generate_bulk': ('.core.bulk', 'generate_bulk'),
+    'write_bulk': ('.core.bulk', 'write_bulk'),
+    'cli_main': ('.cli', 'main'),
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module_name, __name__), attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 def init_database():
+    from .core.version_updater import VersionUpdater
     updater = VersionUpdater()
     return updater.initialize_database()
 
-def update_versions(browser_type="all"):
+def update_versions(browser_type="all", workers=None):
     """
     Update browser version data for specified browser type(s).
     This function updates version information for various browsers by delegating
@@ -27,6 +58,8 @@ def update_versions(browser_type="all"):
             - "opera": Updates Opera browser versions
             - "android": Updates Android browser versions
             - "mac": Updates Mac browser versions
+        workers (int, optional): With "all", how many sources are fetched concurrently.
+            Defaults to the updater's default.
     Returns:
         tuple or dict: 
             - If browser_type is "all": Returns the result from update_all()
@@ -41,10 +74,11 @@ def update_versions(browser_type="all"):
         Chrome: +5 added, 3 updated
     """
 
+    from .core.version_updater import VersionUpdater
     updater = VersionUpdater()
     
     if browser_type.lower() == "all":
-        return updater.update_all()
+        return updater.update_all() if workers is None else updater.update_all(workers)
     elif browser_type.lower() == "chrome":
         added, updated = updater.update_chrome()
         print(f"Chrome: +{added} added, {updated} updated")
@@ -72,6 +106,8 @@ def update_versions(browser_type="all"):
 def generate_user_agent(browser="Chrome"):
     """
     Generate a random user agent string for the specified browser.
+    Uses the process-wide `shared_generator()`, so the catalog is loaded once and
+    reloaded in the background when the database changes.
     
     Args:
         browser (str, optional): The browser type to generate a user agent for.
@@ -86,12 +122,11 @@ def generate_user_agent(browser="Chrome"):
         >>> print(ua)
         Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0
     """
-    generator = UserAgentGenerator()
-    return generator.create_useragent(browser)
+    return shared_generator().create_useragent(browser)
 
 def generate_multiple(count=10):
     """
-    Generate multiple random user agent strings.
+    Generate multiple random user agent strings from the process-wide `shared_generator()`.
     
     Args:
         count (int, optional): The number of user agent strings to generate. Defaults to 10.
@@ -104,25 +139,24 @@ def generate_multiple(count=10):
         >>> len(user_agents)
         5
     """
-    generator = UserAgentGenerator()
-    return generator.get_list(count)
+    return shared_generator().get_list(count)
 
-try:
-    from .cli import main as cli_main
-    __all__.append('cli_main')
-except ImportError:
-    pass
 
-try:
-    import os
-    from pathlib import Path
+def iter_user_agents(browser=None, unique=False, limit=None):
+    """
+    Lazily yield random user agent strings from the process-wide `shared_generator()`.
+    
+    Args:
+        browser (str, optional): "Chrome", "Firefox" or "Opera". Defaults to None,
+            which picks a random browser for every user agent.
+        unique (bool, optional): Never yield the same user agent twice. Defaults to False.
+        limit (int, optional): Stop after this many user agents. Defaults to None (unbounded).
     
-    db_dir = Path(__file__).parent / "data"
-    db_path = db_dir / "useragent.db"
+    Returns:
+        Iterator[str]: An iterator of user agent strings.
     
-    if not db_path.exists():
-        print("Warning: Database not found.")
-        print("Run the 'useragent-gen --init' command before first use.")
-        
-except Exception:
-    pass
\ No newline at end of file
+    Example:
+        >>> for ua in iter_user_agents("Chrome", limit=3):
+        ...     print(ua)
+    """
+    return shared_generator().iter_useragents(browser, unique=unique, limit=limit)
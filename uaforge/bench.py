@@ -0,0 +1,610 @@
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+HEAVY_MODULES = ("requests", "bs4", "lxml", "urllib3")
+IMPORT_BUDGET_MS = 30.0
+
+
+def measure_import_time(module: str = "uaforge", runs: int = 5) -> Dict[str, object]:
+    """
+    Measures the cold import time of a module using `python -X importtime`.
+    Each run uses a fresh interpreter so nothing is cached in-process. The cumulative
+    time reported for the top-level module is collected, and the best run is kept to
+    reduce noise from the machine.
+    Args:
+        module (str, optional): The module to import. Defaults to "uaforge".
+        runs (int, optional): How many fresh interpreters to start. Defaults to 5.
+    Returns:
+        Dict[str, object]: The best and median import time in milliseconds, plus any
+        heavy optional dependencies that were imported along the way.
+    """
+    timings = []
+    heavy_loaded = set()
+
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True,
+        )
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            try:
+                _, cumulative, name = line[len("import time:"):].split("|")
+                cumulative_us = int(cumulative)
+            except ValueError:
+                continue
+            name = name.strip()
+            if name == module:
+                timings.append(cumulative_us / 1000.0)
+            if name.split(".")[0] in HEAVY_MODULES:
+                heavy_loaded.add(name.split(".")[0])
+
+    timings.sort()
+    return {
+        "module": module,
+        "runs": runs,
+        "best_ms": timings[0],
+        "median_ms": timings[len(timings) // 2],
+        "heavy_modules": sorted(heavy_loaded),
+    }
+
+
+class _LegacyRenderer:
+    """
+    The per-call rendering used before templates were compiled into the catalog:
+    a hierarchical platform pick, iPhone/iPad substring checks, system string rewrites,
+    CriOS/FxiOS replacement and Opera version splitting on every user agent. Kept only
+    as the "before" side of `bench_templates`.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def _pick(self):
+        catalog = self.catalog
+        key = random.choice(catalog.platform_keys)
+        system = random.choice(catalog.platforms[key])
+        type_select = random.choice(catalog.version_types.get(key, ("",)))
+        return system, type_select
+
+    @staticmethod
+    def _ios(system):
+        if "iPad" in system:
+            return system.strip(";").replace("Intel Mac OS X", "CPU OS") + " like Mac OS X"
+        return system.strip(";").replace("Intel Mac OS X", "CPU iPhone OS") + " like Mac OS X"
+
+    def create_useragent(self, browser_type):
+        system, type_select = self._pick()
+        catalog = self.catalog
+        ios = "iPhone" in system or "iPad" in system
+        if ios:
+            system = self._ios(system)
+        if browser_type == "Chrome":
+            if ios:
+                version = str(random.choice(catalog.chrome_versions)).replace("Chrome", "CriOS")
+                return f"Mozilla/5.0 ({system}; {type_select}) AppleWebKit/605.1.15 (KHTML, like Gecko) {version} Mobile/15E148 Safari/604.1"
+            version = random.choice(catalog.chrome_versions)
+            return f"Mozilla/5.0 ({system}; {type_select}) AppleWebKit/537.36 (KHTML, like Gecko) {version} Safari/537.36"
+        if browser_type == "Firefox":
+            if ios:
+                version = str(random.choice(catalog.firefox_versions)).replace("Firefox", "FxiOS")
+                return f"Mozilla/5.0 ({system}; {type_select}) Gecko/20100101 {version} Mobile/15E148"
+            version = random.choice(catalog.firefox_versions)
+            return f"Mozilla/5.0 ({system}; {type_select}; rv:109.0) Gecko/20100101 {version}"
+        opera = random.choice(catalog.opera_versions)
+        chrome = random.choice(catalog.chrome_versions)
+        mobile = " Mobile" if ios else ""
+        return f"Mozilla/5.0 ({system}; {type_select}) AppleWebKit/537.36 (KHTML, like Gecko) {chrome}{mobile} Safari/537.36 OPR/{opera.split('/')[0]}"
+
+
+def _per_call_ns(func: Callable[[str], str], browser: str, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func(browser)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def bench_templates(db_path: Optional[str] = None, iterations: int = 200_000) -> Dict[str, object]:
+    """
+    Compares the per-user-agent cost of the legacy per-call rendering with the
+    compiled templates now used by `UserAgentGenerator.create_useragent`.
+    Args:
+        db_path (str, optional): Database to load the catalog from. Defaults to the packaged one.
+        iterations (int, optional): User agents generated per browser and side. Defaults to 200000.
+    Returns:
+        Dict[str, object]: Nanoseconds per user agent for each browser, before and after.
+    """
+    from .core.user_agent import UserAgentGenerator
+
+    generator = UserAgentGenerator(db_path)
+    legacy = _LegacyRenderer(generator.catalog)
+    results = {}
+
+    for browser in ("Chrome", "Firefox", "Opera"):
+        before = _per_call_ns(legacy.create_useragent, browser, iterations)
+        after = _per_call_ns(generator.create_useragent, browser, iterations)
+        results[browser] = {
+            "legacy_ns_per_ua": round(before, 1),
+            "template_ns_per_ua": round(after, 1),
+            "speedup": round(before / after, 2),
+        }
+
+    return {"iterations": iterations, "browsers": results}
+
+
+def _legacy_add_versions(conn, family: str, dt_add: list, dt_update: list):
+    # The per-row write path used before `Database.upsert_versions`, applied to the
+    # same normalized table so only the batching differs.
+    from .core.database import _normalize_date, _version_row
+
+    cursor = conn.cursor()
+    try:
+        for data in dt_add:
+            cursor.execute("INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           _version_row(family, *data))
+        for version, release_date, last_updated in dt_update:
+            cursor.execute("UPDATE versions SET release_date = ?, last_updated = ? WHERE family = ? AND version = ?",
+                           (_normalize_date(release_date), last_updated, family, version))
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def bench_writes(rows: int = 100_000) -> Dict[str, object]:
+    """
+    Measures import throughput for version rows: the legacy per-row `execute` loop versus
+    `Database.upsert_versions`. Each side writes into a fresh temporary database: an insert
+    of `rows` new versions, an update of all of them, and a re-import of the same rows.
+    Both sides commit once per call, so inserts and updates differ only by `executemany`
+    and run at similar speeds. The re-import is where the upsert pays off: it skips rows
+    whose release date did not change, while the legacy `INSERT OR REPLACE` rewrites them.
+    Args:
+        rows (int, optional): Number of version rows to import. Defaults to 100000.
+    Returns:
+        Dict[str, object]: Rows per second for each side and phase.
+    """
+    import tempfile
+    from pathlib import Path
+    from .core.database import Database
+
+    now = "2024-01-01T00:00:00"
+    data = [(f"Chrome/{index // 10000}.0.{index % 10000}.0", "2024-01-01", now) for index in range(rows)]
+    updated = [(version, "2024-02-01", now) for version, _, _ in data]
+    results = {}
+
+    def run(write):
+        timings = {}
+        for phase, dt_add, dt_update in (("insert", data, []), ("update", [], updated),
+                                         ("reimport", updated, [])):
+            start = time.perf_counter()
+            write(dt_add, dt_update)
+            timings[f"{phase}_rows_per_sec"] = round(rows / (time.perf_counter() - start))
+        return timings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with Database(str(Path(tmp) / "legacy.db")) as db:
+            conn = db.get_connection()
+            results["legacy"] = run(lambda dt_add, dt_update: _legacy_add_versions(conn, "chrome", dt_add, dt_update))
+
+        with Database(str(Path(tmp) / "batched.db")) as db:
+            results["batched"] = run(lambda dt_add, dt_update: db.upsert_versions("chrome_versions", dt_add, dt_update))
+
+    return {"rows": rows, **results}
+
+
+def _cmd_writes(args) -> int:
+    print(json.dumps(bench_writes(args.rows), indent=2))
+    return 0
+
+
+FETCH_SOURCES = {
+    "chrome": "fetch_chrome_versions",
+    "firefox": "fetch_firefox_versions",
+    "opera": "fetch_opera_versions",
+    "android": "fetch_android_versions",
+    "macos": "fetch_macos_versions",
+}
+
+
+def bench_fetchers(fixtures: str, record: bool = False, update: bool = False,
+                   db_path: Optional[str] = None) -> Dict[str, object]:
+    """
+    Measures every version source against recorded fixtures, without network access.
+    Each source is fetched twice: once for wall and parse time, and once under
+    `tracemalloc` for peak memory (tracing slows execution down, so the timings come from
+    the untraced run).
+    Args:
+        fixtures (str): Fixture directory (see `VersionFetcher(replay_from=...)`).
+        record (bool, optional): Fetch live and (re)record the fixtures first. Defaults to False.
+        update (bool, optional): Also time a full `VersionUpdater.update_all` into a temporary
+            copy of the database. Defaults to False.
+        db_path (str, optional): Database copied for `update`. Defaults to the packaged one.
+    Returns:
+        Dict[str, object]: Per source: wall and parse time, pages, rows extracted and peak
+        memory (or the error raised), plus the end-to-end update when requested.
+    """
+    import contextlib
+    import io
+    import shutil
+    import tempfile
+    import tracemalloc
+    from pathlib import Path
+    from .core.database import DEFAULT_DB_PATH
+    from .core.version_fetcher import VersionFetcher
+    from .core.version_updater import VersionUpdater
+
+    if record:
+        recorder = VersionFetcher(record_to=fixtures, use_cache=False)
+        for method in FETCH_SOURCES.values():
+            getattr(recorder, method)()
+
+    fetcher = VersionFetcher(replay_from=fixtures)
+    sources = {}
+    for name, method in FETCH_SOURCES.items():
+        fetch = getattr(fetcher, method)
+        fetcher.parse_timings.clear()
+        start = time.perf_counter()
+        try:
+            data = fetch()
+        except Exception as e:
+            sources[name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        elapsed = time.perf_counter() - start
+        timings = list(fetcher.parse_timings)
+
+        tracemalloc.start()
+        try:
+            fetch()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        sources[name] = {
+            "seconds": round(elapsed, 4),
+            "pages": len(timings),
+            "bytes": sum(timing.size for timing in timings),
+            "parse_seconds": round(sum(timing.seconds for timing in timings), 4),
+            "max_page_parse_ms": round(max((timing.seconds for timing in timings), default=0) * 1000, 2),
+            "rows": len(data["Version_list"]),
+            "peak_memory_kib": round(peak / 1024, 1),
+        }
+
+    result = {"fixtures": fixtures, "sources": sources}
+
+    if update:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_copy = str(Path(tmp) / "useragent.db")
+            shutil.copyfile(db_path or str(DEFAULT_DB_PATH), db_copy)
+            updater = VersionUpdater(db_copy)
+            updater.fetcher = VersionFetcher(replay_from=fixtures)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                counts = updater.update_all()
+            result["update"] = {
+                "seconds": round(time.perf_counter() - start, 4),
+                "results": {name: {"added": added, "updated": updated} for name, (added, updated) in counts.items()},
+                "errors": [line.strip() for line in output.getvalue().splitlines() if "error" in line],
+            }
+            updater.db.close()
+
+    return result
+
+
+def _cmd_fetchers(args) -> int:
+    result = bench_fetchers(args.fixtures, args.record, args.update, args.db)
+    sources = result["sources"].values()
+    result["ok"] = all("error" not in source and source["rows"] >= args.min_rows for source in sources)
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+
+def build_synthetic_database(path: str, versions: int = 500, seed: int = 0) -> str:
+    """
+    Writes a synthetic catalog to a fresh database at `path`, shaped like the real data:
+    `versions` Chrome, Firefox and Opera versions each with release dates, and the usual
+    Windows/Linux/Mac/Android/iOS platform and version-type tables.
+    Args:
+        path (str): Database file to create.
+        versions (int, optional): Versions per browser. Defaults to 500.
+        seed (int, optional): Seed for the synthetic data. Defaults to 0.
+    Returns:
+        str: `path`.
+    """
+    import datetime
+    from .core.database import Database
+
+    rng = random.Random(seed)
+    now = datetime.datetime(2024, 1, 1).isoformat()
+    start = datetime.date(2019, 1, 1)
+
+    def rows(render):
+        return [(render(index), (start + datetime.timedelta(days=index * 3)).isoformat(), now)
+                for index in range(versions)]
+
+    platforms = {
+        "Windows": ["Windows NT 6.1", "Windows NT 6.3", "Windows NT 10.0"],
+        "Linux": ["X11; Linux", "X11; Ubuntu; Linux"],
+        "Mac": [f"{device}; Intel Mac OS X {major}_{minor}"
+                for device in ("Macintosh", "iPhone", "iPad") for major, minor in ((10, 15), (11, 6), (12, 0), (13, 0), (14, 0))],
+        "Android": [f"Linux; Android {major}" for major in range(10, 15)],
+    }
+    version_types = {
+        "Windows": ["Win64; x64", "WOW64"],
+        "Linux": ["i686", "x86_64", "i686 on x86_64"],
+        "Mac": [""],
+        "Android": ["armv7l", "armv8l"],
+    }
+
+    with Database(path) as db:
+        db.upsert_versions("chrome_versions", rows(
+            lambda index: f"Chrome/{80 + index // 20}.0.{4000 + index}.{rng.randrange(200)}"))
+        db.upsert_versions("firefox_versions", rows(
+            lambda index: f"Firefox/{70 + index // 4}.{index % 4}"))
+        db.upsert_versions("opera_versions", rows(
+            lambda index: f"{60 + index // 10}.0.{3000 + index}.{rng.randrange(200)}"))
+        db.replace_rows("platforms", [(key, system) for key, systems in platforms.items() for system in systems])
+        db.replace_rows("version_types", [(key, value) for key, values in version_types.items() for value in values])
+    return path
+
+
+def _latency_summary(latencies_ns: List[int], items_per_call: int = 1) -> Dict[str, float]:
+    latencies_ns = sorted(latencies_ns)
+    total_s = sum(latencies_ns) / 1e9
+    count = len(latencies_ns)
+    return {
+        "calls": count,
+        "uas_per_sec": round(count * items_per_call / total_s) if total_s else None,
+        "p50_us": round(latencies_ns[count // 2] / 1000, 2),
+        "p99_us": round(latencies_ns[min(count - 1, int(count * 0.99))] / 1000, 2),
+        "max_us": round(latencies_ns[-1] / 1000, 2),
+    }
+
+
+def _time_calls(func: Callable[[], object], calls: int) -> List[int]:
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    for _ in range(calls):
+        start = clock()
+        func()
+        append(clock() - start)
+    return latencies
+
+
+def _cold_start(db_path: str, runs: int) -> Dict[str, float]:
+    # A fresh interpreter per run: time to import, load the catalog and produce one UA,
+    # measured inside the process (import onwards) and from outside (including startup).
+    script = (
+        "import time; t = time.perf_counter(); "
+        "from uaforge import UserAgentGenerator; "
+        f"UserAgentGenerator({db_path!r}).create_useragent('Chrome'); "
+        "print(time.perf_counter() - t)"
+    )
+    inside, outside = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        outside.append(time.perf_counter() - start)
+        inside.append(float(proc.stdout.strip()))
+    return {
+        "runs": runs,
+        "first_ua_ms": round(min(inside) * 1000, 2),
+        "first_ua_median_ms": round(sorted(inside)[runs // 2] * 1000, 2),
+        "process_to_first_ua_ms": round(min(outside) * 1000, 2),
+    }
+
+
+def _thread_worker(generator, count: int):
+    create = generator.create_useragent
+    for _ in range(count):
+        create("Chrome")
+
+
+def _thread_scaling(generator, max_workers: int, per_worker: int) -> List[Dict[str, object]]:
+    import threading
+
+    results = []
+    for workers in range(1, max_workers + 1):
+        children = generator.spawn(workers)
+        threads = [threading.Thread(target=_thread_worker, args=(child, per_worker)) for child in children]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        results.append({"threads": workers, "uas_per_sec": round(workers * per_worker / elapsed)})
+    return results
+
+
+def _process_scaling(db_path: str, max_workers: int, count: int) -> List[Dict[str, object]]:
+    from .core.bulk import generate_bulk
+
+    results = []
+    chunk_size = max(1, count // (max_workers * 4))
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        produced = sum(len(chunk) for chunk in generate_bulk(
+            count, workers=workers, db_path=db_path, seed=0, chunk_size=chunk_size))
+        elapsed = time.perf_counter() - start
+        results.append({"processes": workers, "uas_per_sec": round(produced / elapsed)})
+    return results
+
+
+def bench_generation(versions: int = 500, iterations: int = 100_000, list_size: int = 1_000_000,
+                     max_workers: Optional[int] = None, cold_runs: int = 5) -> Dict[str, object]:
+    """
+    Runs the generation benchmark suite against a synthetic catalog and returns the results
+    as one JSON-serialisable dict, so runs can be compared across versions.
+    Covered: single-call APIs (`create_useragent`, `generate_user_agent`) and batch APIs
+    (`get_list`, `iter_batches`) with throughput and p50/p99 latency, catalog loading, cold
+    start to the first user agent, peak traced memory for a `list_size` list, and
+    throughput scaling over 1..`max_workers` threads and processes.
+    Args:
+        versions (int, optional): Synthetic versions per browser. Defaults to 500.
+        iterations (int, optional): Calls per single-call measurement. Defaults to 100000.
+        list_size (int, optional): Size of the list used for the memory measurement. Defaults to 1000000.
+        max_workers (int, optional): Largest thread/process count. Defaults to the CPU count.
+        cold_runs (int, optional): Fresh interpreters started for the cold-start time. Defaults to 5.
+    Returns:
+        Dict[str, object]: The results, with the environment and configuration.
+    """
+    import os
+    import platform
+    import tempfile
+    import tracemalloc
+    from pathlib import Path
+    from . import __version__, generate_user_agent
+    from .core.catalog import Catalog
+    from .core.database import Database
+    from .core.user_agent import UserAgentGenerator
+
+    max_workers = max_workers or os.cpu_count() or 1
+    result = {
+        "uaforge_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {"versions": versions, "iterations": iterations, "list_size": list_size,
+                   "max_workers": max_workers, "cold_runs": cold_runs},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = build_synthetic_database(str(Path(tmp) / "synthetic.db"), versions)
+
+        load_ns = []
+        for _ in range(5):
+            with Database(db_path, readonly=True) as db:
+                start = time.perf_counter_ns()
+                Catalog.from_database(db)
+                load_ns.append(time.perf_counter_ns() - start)
+        result["catalog_load"] = {"best_ms": round(min(load_ns) / 1e6, 2),
+                                  "median_ms": round(sorted(load_ns)[2] / 1e6, 2)}
+
+        generator = UserAgentGenerator(db_path, seed=0)
+        result["cardinality"] = generator.cardinality()
+
+        single = {}
+        for browser in ("Chrome", "Firefox", "Opera"):
+            single[f"create_useragent[{browser}]"] = _latency_summary(
+                _time_calls(lambda: generator.create_useragent(browser), iterations))
+        # The module-level helper always reads the packaged database.
+        single["generate_user_agent"] = _latency_summary(
+            _time_calls(generate_user_agent, max(1, iterations // 500)))
+        result["single"] = single
+
+        batch_size = 1000
+        batch_calls = max(1, iterations // batch_size)
+        batches = generator.iter_batches(batch_size)
+        result["batch"] = {
+            f"get_list[{batch_size}]": _latency_summary(
+                _time_calls(lambda: generator.get_list(batch_size), batch_calls), batch_size),
+            f"iter_batches[{batch_size}]": _latency_summary(
+                _time_calls(lambda: next(batches), batch_calls), batch_size),
+        }
+
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            items = generator.get_list(list_size)
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["memory"] = {
+            "list_size": len(items),
+            "peak_traced_mib": round(peak / 2 ** 20, 1),
+            "retained_mib": round(current / 2 ** 20, 1),
+            "seconds_traced": round(elapsed, 2),
+        }
+        del items
+
+        result["cold_start"] = _cold_start(db_path, cold_runs)
+        result["threads"] = _thread_scaling(generator, max_workers, max(1, iterations // 2))
+        result["processes"] = _process_scaling(db_path, max_workers, iterations * 2)
+
+    return result
+
+
+def _cmd_generation(args) -> int:
+    result = bench_generation(args.versions, args.iterations, args.list_size, args.max_workers, args.cold_runs)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+def _cmd_templates(args) -> int:
+    print(json.dumps(bench_templates(args.db, args.iterations), indent=2))
+    return 0
+
+
+def _cmd_import_time(args) -> int:
+    result = measure_import_time(args.module, args.runs)
+    result["budget_ms"] = args.budget_ms
+    result["ok"] = result["best_ms"] <= args.budget_ms and not result["heavy_modules"]
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="uaforge bench", description="UAForge benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import-time", help="Check that 'import uaforge' stays within its time budget")
+    import_parser.add_argument("--module", default="uaforge")
+    import_parser.add_argument("--runs", type=int, default=5)
+    import_parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                               help="Fail if the best cold import exceeds this (default: 30)")
+    import_parser.set_defaults(func=_cmd_import_time)
+
+    templates_parser = subparsers.add_parser(
+        "templates", help="Per-user-agent cost of legacy rendering vs compiled templates")
+    templates_parser.add_argument("--db", help="Database path (default: packaged database)")
+    templates_parser.add_argument("--iterations", type=int, default=200_000)
+    templates_parser.set_defaults(func=_cmd_templates)
+
+    writes_parser = subparsers.add_parser(
+        "writes", help="Rows/sec of per-row vs batched version imports")
+    writes_parser.add_argument("--rows", type=int, default=100_000)
+    writes_parser.set_defaults(func=_cmd_writes)
+
+    fetchers_parser = subparsers.add_parser(
+        "fetchers", help="Per-source fetch/parse time, rows and memory from recorded fixtures")
+    fetchers_parser.add_argument("--fixtures", required=True, help="Fixture directory")
+    fetchers_parser.add_argument("--record", action="store_true",
+                                 help="Fetch live and record the fixtures first (needs network)")
+    fetchers_parser.add_argument("--update", action="store_true",
+                                 help="Also time a full update_all into a temporary database copy")
+    fetchers_parser.add_argument("--db", help="Database copied for --update (default: packaged database)")
+    fetchers_parser.add_argument("--min-rows", type=int, default=1,
+                                 help="Fail if a source extracts fewer rows (default: 1)")
+    fetchers_parser.set_defaults(func=_cmd_fetchers)
+
+    generation_parser = subparsers.add_parser(
+        "generation", help="Throughput, latency, memory, cold start and scaling of generation")
+    generation_parser.add_argument("--versions", type=int, default=500,
+                                   help="Synthetic versions per browser (default: 500)")
+    generation_parser.add_argument("--iterations", type=int, default=100_000)
+    generation_parser.add_argument("--list-size", type=int, default=1_000_000)
+    generation_parser.add_argument("--max-workers", type=int,
+                                   help="Largest thread/process count (default: CPU count)")
+    generation_parser.add_argument("--cold-runs", type=int, default=5)
+    generation_parser.add_argument("--output", "-o", help="Also write the JSON to this file")
+    generation_parser.set_defaults(func=_cmd_generation)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
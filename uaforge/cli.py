@@ -1,9 +1,24 @@
 import argparse
 import sys
 from . import generate_user_agent, generate_multiple, update_versions, init_database, __version__
+from .core.metrics import metrics
 from .core.user_agent import UserAgentGenerator
 
+def _confirm_overwrite(path):
+    import os
+    
+    if os.path.exists(path):
+        overwrite = input(f"The {path} file already exists. Should it be overwritten? (yes/no) : ")
+        if overwrite.lower() != 'y' and overwrite.lower() != 'yes':
+            print("The transaction has been cancelled.")
+            return False
+    return True
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from .bench import main as bench_main
+        sys.exit(bench_main(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
         description="UAForge - UserAgent Generator CLI\n\n",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -11,8 +26,11 @@ def main():
 Examples:
   %(prog)s --count 5 --browser Chrome
   %(prog)s --count 10 --output useragents.txt
+  %(prog)s --count 50000000 --workers 8 --output corpus.txt
   %(prog)s --update all
+  %(prog)s --update all --profile
   %(prog)s --init
+  %(prog)s bench generation --output results.json
         """
     )
     
@@ -27,6 +45,14 @@ Examples:
     parser.add_argument("--output", "-o", 
                        help="Output file (optional)")
     
+    parser.add_argument("--workers", "-w", type=int,
+                       help="Bulk mode: generate across N processes and stream the "
+                            "result (duplicates allowed). With --update all: number of "
+                            "sources fetched concurrently")
+    
+    parser.add_argument("--seed", "-s", type=int,
+                       help="Seed the random generator for reproducible output")
+    
     parser.add_argument("--update", "-u", 
                        choices=["all", "chrome", "firefox", "opera", "android", "windows", "linux", "mac"],
                        help="Update version information.")
@@ -34,11 +60,25 @@ Examples:
     parser.add_argument("--init", action="store_true",
                        help="Populate the database with initial data.")
     
+    parser.add_argument("--profile", action="store_true",
+                       help="Print a breakdown of catalog loads, SQLite statements, generated "
+                            "user agents and fetch/parse times to stderr after the run")
+    
     parser.add_argument("--version", "-v", action="store_true",
                        help="Show version information")
     
     args = parser.parse_args()
     
+    if args.profile:
+        metrics.enable()
+    try:
+        _run(args)
+    finally:
+        if args.profile:
+            print("\nProfile:", file=sys.stderr)
+            print(metrics.report(), file=sys.stderr)
+
+def _run(args):
     if args.version:
         print(f"UAForge v{__version__}")
         return
@@ -55,20 +95,33 @@ Examples:
         if args.update not in "all":
             print(f"{args.update} versions are being updated...")
         try:
-            update_versions(args.update)
+            update_versions(args.update, workers=args.workers)
             print("Update complete!")
         except Exception as e:
             print(f"Error: {e}")
         return
     
-    if args.browser == "random":
-        import random
-        browser = random.choice(["Chrome", "Firefox", "Opera"])
-    else:
-        browser = args.browser
-    
     try:
-        generator = UserAgentGenerator()
+        if args.workers:
+            from .core.bulk import write_bulk
+            
+            bulk_browser = None if args.browser == "random" else args.browser
+            if args.output:
+                if not _confirm_overwrite(args.output):
+                    return
+                with open(args.output, "w", encoding="utf-8") as f:
+                    write_bulk(args.count, f, workers=args.workers, browser=bulk_browser, seed=args.seed)
+                print(f"{args.count} user agent saved to file '{args.output}'.")
+            else:
+                write_bulk(args.count, sys.stdout, workers=args.workers, browser=bulk_browser, seed=args.seed)
+            return
+        
+        generator = UserAgentGenerator(seed=args.seed)
+        
+        if args.browser == "random":
+            browser = generator.rng.choice(["Chrome", "Firefox", "Opera"])
+        else:
+            browser = args.browser
         
         if args.count == 1:
             user_agent = generator.create_useragent(browser)
@@ -78,20 +131,16 @@ Examples:
                 with open(args.output, "w", encoding="utf-8") as f:
                     f.write(user_agent + "\n")
         else:
-            user_agents = generator.get_list(args.count)
+            user_agents = generator.get_list(args.count, browser=None if args.browser == "random" else args.browser)
             
             for i, ua in enumerate(user_agents, 1):
                 print(f"{i:3}. {ua}")
             
             if args.output:
-                import os
                 from .utils import save_useragents_to_file
                 
-                if os.path.exists(args.output):
-                    overwrite = input(f"The {args.output} file already exists. Should it be overwritten? (yes/no) : ")
-                    if overwrite.lower() != 'y' and overwrite.lower() != 'yes':
-                        print("The transaction has been cancelled.")
-                        return
+                if not _confirm_overwrite(args.output):
+                    return
                 
                 save_useragents_to_file(user_agents, args.output)
                 print(f"\n{args.count} user agent saved to file '{args.output}'.")
@@ -1,6 +1,14 @@
 from ..core.user_agent import UserAgentGenerator
 from ..core.database import Database
-from ..core.version_fetcher import VersionFetcher
+from ..core.catalog import Catalog
+from ..core.sampling import Weights
 
 __version__ = "1.1.1"
-__all__ = ['UserAgentGenerator', 'Database', 'VersionFetcher', 'generate_user_agent', 'generate_multiple']
+__all__ = ['UserAgentGenerator', 'Database', 'Catalog', 'Weights', 'VersionFetcher', 'generate_user_agent', 'generate_multiple']
+
+
+def __getattr__(name):
+    if name == 'VersionFetcher':
+        from .version_fetcher import VersionFetcher
+        return VersionFetcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
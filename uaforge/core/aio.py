@@ -0,0 +1,207 @@
+import asyncio
+import random
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+from .catalog import Catalog
+from .database import Database
+from .sampling import Weights
+from .user_agent import UserAgentGenerator
+
+
+def _open_catalog(db_path: Optional[str], weights: Optional[Weights]) -> Tuple[Database, Catalog]:
+    db = Database(db_path, readonly=True)
+    return db, Catalog.from_database(db, weights)
+
+
+class AsyncUserAgentGenerator(UserAgentGenerator):
+    """
+    AsyncUserAgentGenerator
+    A `UserAgentGenerator` for asyncio applications. Loading the catalog (at construction
+    and on `refresh()`) reads SQLite in an executor thread, so the event loop is never
+    blocked on the database. Generation is inherited unchanged: `create_useragent`,
+    `get_list`, `iter_useragents` and friends stay plain synchronous calls on the
+    in-memory catalog, with no await per user agent.
+    Build instances with `await AsyncUserAgentGenerator.create()`; the constructor itself
+    only accepts an already loaded catalog.
+    Args:
+        catalog (Catalog): The catalog to generate from.
+        db_path (str, optional): Database that `refresh()` reloads from. Defaults to the packaged one.
+        seed (int, optional): Seed for reproducible output.
+        rng (random.Random, optional): RNG to use instead of a new one.
+        weights (Weights, optional): Sampling weights. Defaults to the catalog's.
+        executor (Executor, optional): Where database reads run. Defaults to the loop's
+            default executor.
+    Example:
+        >>> generator = await AsyncUserAgentGenerator.create()
+        >>> generator.create_useragent("Chrome")
+        >>> await generator.refresh()
+    """
+
+    def __init__(self, catalog: Catalog, db_path: str = None, seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None, weights: Optional[Weights] = None,
+                 executor: Optional[Executor] = None):
+        super().__init__(db_path, catalog=catalog, seed=seed, rng=rng, weights=weights)
+        self.executor = executor
+
+    @classmethod
+    async def create(cls, db_path: str = None, seed: Optional[int] = None, rng: Optional[random.Random] = None,
+                     weights: Optional[Weights] = None,
+                     executor: Optional[Executor] = None) -> "AsyncUserAgentGenerator":
+        """
+        Loads the catalog off the event loop and returns a ready generator.
+        Args:
+            Same as the constructor, without `catalog`.
+        Returns:
+            AsyncUserAgentGenerator: The new generator.
+        """
+        loop = asyncio.get_running_loop()
+        db, catalog = await loop.run_in_executor(executor, _open_catalog, db_path, weights)
+        generator = cls(catalog, db_path, seed=seed, rng=rng, weights=weights, executor=executor)
+        generator._db = db
+        return generator
+
+    async def refresh(self) -> Catalog:
+        """
+        Reloads the catalog in the executor and swaps it in. Generation keeps using the
+        previous catalog until the new one is fully loaded.
+        Returns:
+            Catalog: The newly loaded catalog.
+        """
+        loop = asyncio.get_running_loop()
+        self.catalog = await loop.run_in_executor(
+            self.executor, partial(Catalog.from_database, self.db, self.weights))
+        return self.catalog
+
+
+class AsyncVersionUpdater:
+    """
+    AsyncVersionUpdater
+    Updates browser versions from asyncio code without blocking the event loop.
+    Source fetches run concurrently on a pool of `workers` threads through the fetcher's
+    shared `HttpClient` (pooled connections, retries, per-host limits, circuit breaking),
+    and are awaited from the loop. All database work runs on one dedicated thread, in
+    the order results arrive, like `VersionUpdater.update_all` does on its calling thread.
+    Args:
+        db_path (str, optional): Database to update. Defaults to the packaged one.
+        workers (int, optional): Number of sources fetched concurrently. Defaults to 4.
+        updater (VersionUpdater, optional): Updater to drive, e.g. one with a replaying
+            fetcher. Defaults to a new `VersionUpdater(db_path, wal=wal)`, created on the
+            database thread.
+        wal (bool, optional): Use WAL journaling for the database (never applied to the
+            packaged one). Defaults to True.
+    Example:
+        >>> async with AsyncVersionUpdater() as updater:
+        ...     results = await updater.update_all()
+        ...     added, updated = await updater.update("firefox")
+    """
+
+    def __init__(self, db_path: str = None, workers: int = 4, updater=None, wal: bool = True):
+        self.db_path = db_path
+        self.wal = wal
+        self.workers = workers
+        self._updater = updater
+        self._fetch_pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="uaforge-fetch")
+        self._db_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uaforge-db")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Shuts the worker threads down without waiting for fetches still in flight.
+        """
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._db_pool.shutdown(wait=False)
+
+    async def _run_db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._db_pool, partial(func, *args))
+
+    def _load_sources(self, refresh_lookups: bool = False) -> Dict[str, Tuple[Any, Any]]:
+        # Runs on the database thread, which also owns the lazily created updater and fetcher.
+        if self._updater is None:
+            from .version_updater import VersionUpdater
+            self._updater = VersionUpdater(self.db_path, wal=self.wal)
+        if refresh_lookups:
+            self._updater.update_platforms()
+            self._updater.update_version_types()
+        return self._updater._sources()
+
+    async def update(self, source: str) -> Tuple[int, int]:
+        """
+        Fetches and applies one source.
+        Args:
+            source (str): "chrome", "firefox", "opera", "android" or "mac" (case-insensitive).
+        Returns:
+            Tuple[int, int]: The number of versions added and updated.
+        Raises:
+            ValueError: If the source is unsupported.
+        """
+        sources = await self._run_db(self._load_sources)
+        name = {key.lower(): key for key in sources}.get(source.lower())
+        if name is None:
+            raise ValueError(f"Unsupported browser type: {source}")
+
+        fetch, apply = sources[name]
+        await self._run_db(self._updater._set_deadline, None)
+        loop = asyncio.get_running_loop()
+        try:
+            web_data = await loop.run_in_executor(self._fetch_pool, self._updater._timed_fetch, name, fetch)
+        except Exception as e:
+            print(f"{name} update error: {e}")
+            return 0, 0
+        return await self._run_db(self._updater._timed_apply, name, apply, web_data)
+
+    async def update_all(self, timeout: float = 300.0) -> Dict[str, Tuple[int, int]]:
+        """
+        The asyncio counterpart of `VersionUpdater.update_all`: fetches every source
+        concurrently, applies each result as soon as it arrives and prints the same summary.
+        Sources still running after `timeout` seconds are reported as errors; the HTTP
+        client's deadline makes their requests give up shortly afterwards.
+        Args:
+            timeout (float, optional): Upper bound in seconds for all fetches. Defaults to 300.
+        Returns:
+            Dict[str, Tuple[int, int]]: (added, updated) for each source.
+        """
+        print("All versions are being updated...")
+        sources = await self._run_db(self._load_sources, True)
+        updater = self._updater
+        results = {name: (0, 0) for name in list(sources) + ['Windows', 'Linux']}
+
+        loop = asyncio.get_running_loop()
+        client = await self._run_db(updater._set_deadline, timeout)
+        deadline = loop.time() + timeout
+        futures = {loop.run_in_executor(self._fetch_pool, updater._timed_fetch, name, fetch): name
+                   for name, (fetch, _) in sources.items()}
+        pending = set(futures)
+        try:
+            results['Windows'] = await self._run_db(updater.update_windows)
+            results['Linux'] = await self._run_db(updater.update_linux)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, deadline - loop.time()),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    name = futures[future]
+                    try:
+                        web_data = future.result()
+                    except Exception as e:
+                        print(f"{name} update error: {e}")
+                        continue
+                    results[name] = await self._run_db(updater._timed_apply, name, sources[name][1], web_data)
+
+            for future in pending:
+                print(f"{futures[future]} update error: timed out after {timeout:g}s")
+                future.cancel()
+        finally:
+            if client is not None and not pending:
+                client.set_deadline(None)
+
+        updater._print_results(results)
+        return results
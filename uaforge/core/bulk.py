@@ -0,0 +1,140 @@
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterator, List, Optional, Union
+
+from .catalog import BROWSERS
+from .permutation import FeistelPermutation
+from .rng import derive_seed
+from .user_agent import UserAgentGenerator, iter_permutation
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+_worker_generator: Optional[UserAgentGenerator] = None
+
+
+def _init_worker(db_path: Optional[str]):
+    global _worker_generator
+    _worker_generator = UserAgentGenerator(db_path)
+
+
+def _generate_chunk(index: int, start: int, size: int, browser: Optional[str], base_seed: int,
+                    unique: bool, as_text: bool) -> Union[str, List[str]]:
+    if unique:
+        # All workers walk the same keyed permutation of the catalog's index space and
+        # each chunk decodes its own disjoint range of positions, so no agent repeats.
+        catalog = _worker_generator.catalog
+        permutation = FeistelPermutation(catalog.cardinality(browser), base_seed)
+        chunk = list(iter_permutation(catalog, permutation, start, start + size, browser))
+    else:
+        # Every chunk gets its own stream derived from (base_seed, index), so streams never
+        # overlap between workers and a chunk's contents do not depend on which process or
+        # how many workers ran it.
+        _worker_generator.rng = random.Random(derive_seed(base_seed, index))
+        chunk = next(_worker_generator.iter_batches(size, browser=browser, limit=size), [])
+    if as_text:
+        return "".join(user_agent + "\n" for user_agent in chunk)
+    return chunk
+
+
+def _check_args(count: int, browser: Optional[str], chunk_size: int, unique: bool, db_path: Optional[str]):
+    if count < 0:
+        raise ValueError(f"count must be non-negative, got {count}")
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if browser is not None and browser not in BROWSERS:
+        raise ValueError(f"Desteklenmeyen tarayıcı tipi: {browser}")
+    if unique:
+        capacity = UserAgentGenerator(db_path).cardinality(browser)
+        if count > capacity:
+            raise ValueError(
+                f"Requested {count} unique user agents but the catalog can only produce {capacity}. "
+                "Run '--update all' to add more versions or request fewer."
+            )
+
+
+def _iter_chunks(count: int, workers: Optional[int], browser: Optional[str], chunk_size: int,
+                 db_path: Optional[str], seed: Optional[int], unique: bool, as_text: bool):
+    workers = workers or os.cpu_count() or 1
+    base_seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+    chunks = [(index, start, min(chunk_size, count - start))
+              for index, start in enumerate(range(0, count, chunk_size))]
+
+    if not chunks:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(db_path,)) as executor:
+        pending = deque()
+        remaining = iter(chunks)
+
+        def submit_next():
+            chunk = next(remaining, None)
+            if chunk is not None:
+                pending.append(executor.submit(_generate_chunk, *chunk, browser, base_seed, unique, as_text))
+
+        # Keep a bounded number of chunks in flight so a slow consumer applies
+        # back-pressure instead of letting finished chunks pile up in memory.
+        for _ in range(workers * 2):
+            submit_next()
+
+        while pending:
+            result = pending.popleft().result()
+            submit_next()
+            yield result
+
+
+def generate_bulk(count: int, workers: int = None, browser: str = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, db_path: str = None,
+                  seed: int = None, unique: bool = False) -> Iterator[List[str]]:
+    """
+    Generates a large number of user agents across a pool of worker processes.
+    Work is split into chunks of `chunk_size`. Each worker process loads its own catalog
+    once and every chunk gets an independent RNG stream. Chunks are yielded in order as
+    they complete, with only a few of them in flight at any time.
+    With a `seed`, the output is identical for any number of workers as long as
+    `chunk_size` stays the same.
+    With `unique=True`, chunks decode disjoint ranges of one shared permutation of the
+    catalog's combination space (see `UserAgentGenerator.sample_unique`), so the output
+    has no duplicates without any cross-process coordination.
+    Args:
+        count (int): Total number of user agents to generate.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        browser (str, optional): "Chrome", "Firefox" or "Opera". Defaults to a random browser per agent.
+        chunk_size (int, optional): User agents per task. Defaults to 100000.
+        db_path (str, optional): Database path each worker loads its catalog from.
+        seed (int, optional): Base seed for reproducible output. Defaults to OS entropy.
+        unique (bool, optional): Produce distinct user agents only. Defaults to False.
+    Returns:
+        Iterator[List[str]]: Lists of user agents, `count` in total.
+    Example:
+        >>> for chunk in generate_bulk(1_000_000, workers=4):
+        ...     handle(chunk)
+    """
+    _check_args(count, browser, chunk_size, unique, db_path)
+    return _iter_chunks(count, workers, browser, chunk_size, db_path, seed, unique, as_text=False)
+
+
+def write_bulk(count: int, output: IO[str], workers: int = None, browser: str = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, db_path: str = None, seed: int = None,
+               unique: bool = False) -> int:
+    """
+    Generates user agents in parallel and streams them, one per line, to a single writer.
+    Workers send back pre-joined text blocks, which keeps the inter-process transfer and
+    the writer's work to one string per chunk.
+    Args:
+        count (int): Total number of user agents to write.
+        output (IO[str]): A text stream opened for writing.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        browser (str, optional): Browser to generate for. Defaults to a random browser per agent.
+        chunk_size (int, optional): User agents per task. Defaults to 100000.
+        db_path (str, optional): Database path each worker loads its catalog from.
+        seed (int, optional): Base seed for reproducible output. Defaults to OS entropy.
+        unique (bool, optional): Produce distinct user agents only. Defaults to False.
+    Returns:
+        int: The number of user agents written.
+    """
+    _check_args(count, browser, chunk_size, unique, db_path)
+    for block in _iter_chunks(count, workers, browser, chunk_size, db_path, seed, unique, as_text=True):
+        output.write(block)
+    return count
@@ -0,0 +1,290 @@
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from .metrics import metrics
+from .sampling import AliasTable, Weights
+
+BROWSERS = ("Chrome", "Firefox", "Opera")
+
+
+class Template(NamedTuple):
+    """
+    A pre-rendered user agent for one (browser, platform system, version type) combination.
+    Rendering is `prefix + versions[i] + suffix`, followed by `extra[j]` when the browser
+    needs a second version token (Opera's "OPR/<version>"). `i` and `j` are drawn from
+    the alias tables compiled alongside the version tuples.
+    """
+    prefix: str
+    versions: Tuple[str, ...]
+    suffix: str
+    extra: Tuple[str, ...] = ()
+    version_table: Optional[AliasTable] = None
+    extra_table: Optional[AliasTable] = None
+
+
+def _freeze_groups(groups: Mapping[str, Iterable[str]]) -> Mapping[str, Tuple[str, ...]]:
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
+
+
+def _build_index(templates: Iterable[Template],
+                 template_weights: Iterable[float]) -> Tuple[Tuple[Template, ...], Tuple[int, ...], int]:
+    """
+    Numbers every distinct user agent a set of templates can render.
+    Only reachable combinations are numbered: templates weighted 0 are skipped (version
+    pools already hold positively weighted tokens only). Templates with the same fixed
+    text (e.g. a system listed under two platform keys) are kept once. Each remaining
+    template owns a contiguous block of indices, one per (version, extra version) pair.
+    Returns:
+        Tuple[Tuple[Template, ...], Tuple[int, ...], int]: The distinct templates, the
+        first index of each template's block, and the total number of user agents.
+    """
+    distinct = {}
+    for template, weight in zip(templates, template_weights):
+        if weight > 0:
+            distinct.setdefault((template.prefix, template.suffix), template)
+
+    starts = []
+    total = 0
+    for template in distinct.values():
+        starts.append(total)
+        total += len(template.versions) * max(len(template.extra), 1)
+    return tuple(distinct.values()), tuple(starts), total
+
+
+def _is_ios(system: str) -> bool:
+    return "iPhone" in system or "iPad" in system
+
+
+def _ios_system(system: str) -> str:
+    if "iPad" in system:
+        return system.strip(";").replace("Intel Mac OS X", "CPU OS") + " like Mac OS X"
+    return system.strip(";").replace("Intel Mac OS X", "CPU iPhone OS") + " like Mac OS X"
+
+
+def _version_pool(versions: Tuple[str, ...], weights: Dict[str, float],
+                  render: Callable[[str], str] = str) -> Tuple[Tuple[str, ...], Optional[AliasTable]]:
+    """
+    Renders a browser's versions into the tokens used in user agents, merging versions
+    that render identically, and compiles their weights into an alias table. Tokens
+    weighted 0 can never be drawn and are left out.
+    """
+    pooled: Dict[str, float] = {}
+    for version in versions:
+        token = render(version)
+        pooled[token] = pooled.get(token, 0.0) + weights[version]
+    pooled = {token: weight for token, weight in pooled.items() if weight > 0}
+    if not pooled:
+        return (), None
+    return tuple(pooled), AliasTable(list(pooled.values()))
+
+
+def _compile_templates(platform_keys, platforms, version_types, chrome_versions, firefox_versions,
+                       opera_versions, release_dates, weights: Weights):
+    """
+    Pre-renders every (browser, system, version type) combination into a `Template`.
+    The iOS system rewrites, the CriOS/FxiOS version tokens and Opera's short version
+    tokens are all computed here once instead of on every generated user agent, and
+    every weighted choice is compiled into an alias table.
+    A browser whose version pool is empty (e.g. no Opera versions stored yet) gets no
+    templates at all, so it can never render an agent with a missing version token.
+    Returns:
+        Tuple[Dict[str, Tuple[Template, ...]], Optional[AliasTable], Tuple[float, ...]]:
+        Templates for every browser that has some, the template selection table shared by
+        all of them, and the template weights it was built from. With default weights the
+        table reproduces the generator's historical distribution: a uniform platform key,
+        then a uniform system and version type within that key.
+    """
+    chrome_weights = weights.version_weights(chrome_versions, release_dates)
+    firefox_weights = weights.version_weights(firefox_versions, release_dates)
+    opera_weights = weights.version_weights(opera_versions, release_dates)
+
+    chrome = _version_pool(chrome_versions, chrome_weights)
+    crios = _version_pool(chrome_versions, chrome_weights, lambda version: version.replace("Chrome", "CriOS"))
+    firefox = _version_pool(firefox_versions, firefox_weights)
+    fxios = _version_pool(firefox_versions, firefox_weights, lambda version: version.replace("Firefox", "FxiOS"))
+    opera = _version_pool(opera_versions, opera_weights, lambda version: version.split("/")[0])
+
+    available = {"Chrome": bool(chrome[0]), "Firefox": bool(firefox[0]), "Opera": bool(chrome[0] and opera[0])}
+    templates = {browser: [] for browser in BROWSERS}
+    template_weights = []
+    key_total = sum(weights.platform_weight(key) for key in platform_keys)
+
+    for key in platform_keys:
+        systems = platforms[key]
+        types = version_types.get(key) or ("",)
+        system_total = sum(weights.system_weight(system) for system in systems)
+        type_total = sum(weights.version_type_weight(type_select) for type_select in types)
+        key_weight = weights.platform_weight(key) / key_total if key_total else 0.0
+
+        for system in systems:
+            system_weight = weights.system_weight(system) / system_total if system_total else 0.0
+            ios = _is_ios(system)
+            if ios:
+                system = _ios_system(system)
+
+            for type_select in types:
+                head = f"Mozilla/5.0 ({system}; {type_select})"
+                if ios:
+                    templates["Chrome"].append(Template(
+                        f"{head} AppleWebKit/605.1.15 (KHTML, like Gecko) ", crios[0],
+                        " Mobile/15E148 Safari/604.1", (), crios[1]))
+                    templates["Firefox"].append(Template(
+                        f"{head} Gecko/20100101 ", fxios[0], " Mobile/15E148", (), fxios[1]))
+                    templates["Opera"].append(Template(
+                        f"{head} AppleWebKit/537.36 (KHTML, like Gecko) ", chrome[0],
+                        " Mobile Safari/537.36 OPR/", opera[0], chrome[1], opera[1]))
+                else:
+                    templates["Chrome"].append(Template(
+                        f"{head} AppleWebKit/537.36 (KHTML, like Gecko) ", chrome[0], " Safari/537.36",
+                        (), chrome[1]))
+                    templates["Firefox"].append(Template(
+                        f"Mozilla/5.0 ({system}; {type_select}; rv:109.0) Gecko/20100101 ", firefox[0], "",
+                        (), firefox[1]))
+                    templates["Opera"].append(Template(
+                        f"{head} AppleWebKit/537.36 (KHTML, like Gecko) ", chrome[0],
+                        " Safari/537.36 OPR/", opera[0], chrome[1], opera[1]))
+
+                type_weight = weights.version_type_weight(type_select) / type_total if type_total else 0.0
+                template_weights.append(key_weight * system_weight * type_weight)
+
+    template_table = AliasTable(template_weights) if template_weights else None
+    compiled = {browser: tuple(items) for browser, items in templates.items() if items and available[browser]}
+    return compiled, template_table, tuple(template_weights)
+
+
+class Catalog:
+    """
+    Catalog
+    An immutable, in-memory snapshot of everything needed to generate user agents.
+    The catalog is read from the database once, in a single transaction, and is never
+    written to afterwards. Generators sample exclusively from it, so producing a user
+    agent performs no I/O. To pick up new data, load a fresh catalog and swap it in.
+    Attributes:
+        platforms (Mapping[str, Tuple[str, ...]]): Platform key to available system strings.
+        platform_keys (Tuple[str, ...]): The platform keys, in load order.
+        version_types (Mapping[str, Tuple[str, ...]]): Platform key to available version types.
+        chrome_versions (Tuple[str, ...]): Available Chrome version tokens.
+        firefox_versions (Tuple[str, ...]): Available Firefox version tokens.
+        opera_versions (Tuple[str, ...]): Available Opera version tokens.
+        release_dates (Mapping[str, str]): Stored release date per browser version, if known.
+        weights (Weights): The sampling weights the catalog was compiled with.
+        templates (Mapping[str, Tuple[Template, ...]]): Pre-rendered templates per browser,
+            compiled when the catalog is built. Browsers without any stored versions are absent.
+        template_table (AliasTable): Weighted template selection, aligned with every
+            browser's template tuple.
+        browser_weights (Mapping[str, float]): Relative weight of each browser.
+    Example:
+        >>> catalog = Catalog.from_database(Database())
+        >>> catalog.chrome_versions[0]
+        'Chrome/100.0.4896.20'
+    """
+
+    __slots__ = ("platforms", "platform_keys", "version_types", "chrome_versions", "firefox_versions", "opera_versions",
+                 "release_dates", "weights", "templates", "template_table", "browser_weights",
+                 "_index", "_cardinalities")
+
+    def __init__(self, platforms: Mapping[str, Iterable[str]], version_types: Mapping[str, Iterable[str]],
+                 chrome_versions: Iterable[str], firefox_versions: Iterable[str], opera_versions: Iterable[str],
+                 release_dates: Mapping[str, str] = None, weights: Weights = None):
+        object.__setattr__(self, "platforms", _freeze_groups(platforms))
+        object.__setattr__(self, "platform_keys", tuple(self.platforms))
+        object.__setattr__(self, "version_types", _freeze_groups(version_types))
+        object.__setattr__(self, "chrome_versions", tuple(chrome_versions))
+        object.__setattr__(self, "firefox_versions", tuple(firefox_versions))
+        object.__setattr__(self, "opera_versions", tuple(opera_versions))
+        object.__setattr__(self, "release_dates", MappingProxyType(dict(release_dates or {})))
+        object.__setattr__(self, "weights", weights if weights is not None else Weights())
+
+        templates, template_table, template_weights = _compile_templates(
+            self.platform_keys, self.platforms, self.version_types,
+            self.chrome_versions, self.firefox_versions, self.opera_versions,
+            self.release_dates, self.weights)
+        object.__setattr__(self, "templates", MappingProxyType(templates))
+        object.__setattr__(self, "template_table", template_table)
+        object.__setattr__(self, "browser_weights", MappingProxyType(
+            {browser: self.weights.browser_weight(browser) for browser in BROWSERS}))
+        index = {browser: _build_index(templates.get(browser, ()), template_weights) for browser in BROWSERS}
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_cardinalities", {browser: entry[2] for browser, entry in index.items()})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Catalog is immutable; load a new one instead")
+
+    def __delattr__(self, name):
+        raise AttributeError("Catalog is immutable; load a new one instead")
+
+    def __repr__(self) -> str:
+        return (f"Catalog(platforms={sum(len(v) for v in self.platforms.values())}, "
+                f"chrome={len(self.chrome_versions)}, firefox={len(self.firefox_versions)}, "
+                f"opera={len(self.opera_versions)})")
+
+    def cardinality(self, browser: str = None) -> int:
+        """
+        Returns how many distinct user agents this catalog can produce. Only reachable
+        combinations count: anything weighted 0 is excluded.
+        Args:
+            browser (str, optional): Restrict the count to "Chrome", "Firefox" or "Opera".
+                Defaults to None, which counts all browsers with a positive browser weight.
+        Returns:
+            int: The number of distinct user agent strings.
+        Raises:
+            ValueError: If an unsupported browser type is provided.
+        """
+        if browser is None:
+            return sum(size for name, size in self._cardinalities.items() if self.browser_weights[name] > 0)
+        try:
+            return self._cardinalities[browser]
+        except KeyError:
+            raise ValueError(f"Desteklenmeyen tarayıcı tipi: {browser}") from None
+
+    def useragent_at(self, index: int, browser: str = None) -> str:
+        """
+        Decodes the `index`-th distinct user agent of the catalog.
+        Indices run from 0 to `cardinality(browser) - 1` and map one-to-one onto the
+        distinct user agents: browsers in order, then templates, then version choices.
+        Decoding is a short bisect over the templates plus a divmod, with no iteration
+        over the version lists.
+        Args:
+            index (int): Position in the combination space.
+            browser (str, optional): Index only this browser's user agents. Defaults to all browsers.
+        Returns:
+            str: The user agent at that position.
+        Raises:
+            IndexError: If `index` is out of range.
+            ValueError: If an unsupported browser type is provided.
+        """
+        if not 0 <= index < self.cardinality(browser):
+            raise IndexError("user agent index out of range")
+
+        if browser is None:
+            for browser in BROWSERS:
+                size = self._cardinalities[browser] if self.browser_weights[browser] > 0 else 0
+                if index < size:
+                    break
+                index -= size
+
+        templates, starts, _ = self._index[browser]
+        position = bisect_right(starts, index) - 1
+        template = templates[position]
+        offset = index - starts[position]
+
+        if template.extra:
+            version, extra = divmod(offset, len(template.extra))
+            return template.prefix + template.versions[version] + template.suffix + template.extra[extra]
+        return template.prefix + template.versions[offset] + template.suffix
+
+    @classmethod
+    def from_database(cls, db, weights: Weights = None) -> "Catalog":
+        """
+        Loads a catalog from the given database in a single read.
+        Args:
+            db (Database): The database to read platforms, version types and browser versions from.
+            weights (Weights, optional): Sampling weights to compile in. Defaults to uniform.
+        Returns:
+            Catalog: A new immutable snapshot of the database contents.
+        """
+        with metrics.timer("catalog_load_seconds"):
+            with metrics.timer("catalog_read_seconds"):
+                data: Dict[str, object] = db.get_catalog_data()
+            return cls(**data, weights=weights)
@@ -1,94 +1,250 @@
 import sqlite3
 import os
-from typing import List, Tuple, Dict, Any
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
-class Database:
-    
-    def __init__(self, db_path: str = None):
-        if db_path is None:
-            current_dir = Path(__file__).parent
-            db_dir = current_dir.parent / "data"
-            db_dir.mkdir(exist_ok=True)
-            db_path = str(db_dir / "useragent.db")
-        
-        self.db_path = db_path
-        self._init_database()
-    
-    def _init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chrome_versions (
-                version TEXT PRIMARY KEY,
-                release_date TEXT,
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS firefox_versions (
-                version TEXT PRIMARY KEY,
-                release_date TEXT,
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS opera_versions (
-                version TEXT PRIMARY KEY,
-                release_date TEXT,
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS android_versions (
-                version TEXT PRIMARY KEY,
-                release_date TEXT,
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS windows_versions (
-                version TEXT PRIMARY KEY,
-                release_date TEXT,
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS macos_versions (
+from .metrics import metrics
+from .versions import parse_release_date, parse_version_components
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "useragent.db"
+
+VERSION_FAMILIES = ("chrome", "firefox", "opera", "android", "windows", "macos")
+
+# Legacy per-family table names. Since schema 2 they are read-only views over `versions`.
+VERSION_TABLES = tuple(f"{family}_versions" for family in VERSION_FAMILIES)
+
+LOOKUP_TABLES = {
+    "platforms": ("platform", "system_info"),
+    "version_types": ("platform", "version_type"),
+}
+
+def _create_base_tables(conn: sqlite3.Connection):
+    # Schema 1: the original per-browser tables. `IF NOT EXISTS` lets databases created
+    # before schema versioning (user_version 0, tables present) adopt it unchanged.
+    for table in VERSION_TABLES:
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
                 version TEXT PRIMARY KEY,
                 release_date TEXT,
                 last_updated TEXT
             )
         ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS platforms (
-                platform TEXT,
-                system_info TEXT,
-                PRIMARY KEY (platform, system_info)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS version_types (
-                platform TEXT,
-                version_type TEXT,
-                PRIMARY KEY (platform, version_type)
-            )
+    
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS platforms (
+            platform TEXT,
+            system_info TEXT,
+            PRIMARY KEY (platform, system_info)
+        )
+    ''')
+    
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS version_types (
+            platform TEXT,
+            version_type TEXT,
+            PRIMARY KEY (platform, version_type)
+        )
+    ''')
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date(release_date):
+    # Cached: fetchers stamp many rows with the same date string.
+    parsed = parse_release_date(release_date)
+    return parsed.isoformat() if parsed else None
+
+
+def _version_row(family: str, version: str, release_date, last_updated) -> tuple:
+    # One row of the normalized `versions` table.
+    return (family, version, *parse_version_components(version),
+            _normalize_date(release_date), last_updated)
+
+
+def _normalize_versions(conn: sqlite3.Connection):
+    # Schema 2: move the six identical per-family tables into one `versions` table with
+    # numeric components and ISO release dates, and keep the old names as views so
+    # existing queries (and code reading older databases) work on both schemas.
+    conn.execute('''
+        CREATE TABLE versions (
+            family TEXT NOT NULL,
+            version TEXT NOT NULL,
+            major INTEGER,
+            minor INTEGER,
+            build INTEGER,
+            patch INTEGER,
+            release_date TEXT,
+            last_updated TEXT,
+            PRIMARY KEY (family, version)
+        ) WITHOUT ROWID
+    ''')
+    
+    for family, table in zip(VERSION_FAMILIES, VERSION_TABLES):
+        rows = conn.execute(f"SELECT version, release_date, last_updated FROM {table}").fetchall()
+        conn.executemany(
+            "INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (_version_row(family, *row) for row in rows)
+        )
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f'''
+            CREATE VIEW {table} AS
+            SELECT version, release_date, last_updated FROM versions WHERE family = '{family}'
         ''')
+    
+    # WITHOUT ROWID secondary indexes carry the primary key, so both indexes cover
+    # `version` and answer recency/range queries without touching the table.
+    conn.execute("CREATE INDEX idx_versions_family_major ON versions (family, major, minor, build, patch)")
+    conn.execute("CREATE INDEX idx_versions_family_release ON versions (family, release_date)")
+
+
+# Schema migrations, applied in order. Migration N (1-based) moves a database from
+# `user_version` N-1 to N; append new migrations, never edit or reorder existing ones.
+MIGRATIONS = [
+    _create_base_tables,
+    _normalize_versions,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def _count_statement(statement: str):
+    metrics.increment("sqlite_statements")
+
+
+class Database:
+    """
+    Database
+    SQLite storage for browser versions, platforms and version types.
+    Each thread gets one persistent connection, opened on first use and reused by every
+    method, so a `Database` costs a single `sqlite3.connect` per thread rather than one per
+    query.
+    Args:
+        db_path (str, optional): Path to the database file. Defaults to the packaged database.
+        readonly (bool, optional): Open with `mode=ro`. Nothing is created or written, which
+            suits packaged or shared files on read-only filesystems. Defaults to False.
+        immutable (bool, optional): Additionally promise SQLite that the file never changes
+            (`immutable=1`), which skips locking entirely. Only use it for files nothing writes
+            to, such as the packaged database. Implies `readonly`. Defaults to False.
+        wal (bool, optional): Switch a writable database to WAL journaling, which lets readers
+            keep reading a consistent snapshot while an updater writes. The mode persists in
+            the file, and a WAL database can no longer be opened read-only from a directory
+            the reader cannot write to, so this is opt-in and ignored for the packaged
+            database (which is switched back to rollback journaling if an older version left
+            it in WAL mode). Defaults to False.
+    Example:
+        >>> db = Database(readonly=True)
+        >>> versions, _ = db.get_chrome_vers()
+    """
+    
+    def __init__(self, db_path: str = None, readonly: bool = False, immutable: bool = False,
+                 wal: bool = False):
+        if db_path is None:
+            db_path = str(DEFAULT_DB_PATH)
         
-        conn.commit()
-        conn.close()
+        self.db_path = db_path
+        self.readonly = readonly or immutable
+        self.immutable = immutable
+        self._packaged = db_path != ":memory:" and Path(db_path).resolve() == DEFAULT_DB_PATH.resolve()
+        self.wal = wal and db_path != ":memory:" and not self._packaged
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        if not self.readonly:
+            self._init_database()
     
-    def get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def _open(self) -> sqlite3.Connection:
+        if self.readonly:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            if self.immutable:
+                uri += "&immutable=1"
+            conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+        else:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            if self.wal and os.access(self.db_path, os.W_OK):
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            elif self._packaged:
+                conn.execute("PRAGMA journal_mode=DELETE")
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        with metrics.timer("sqlite_connect_seconds"):
+            conn = self._open()
+        if metrics.enabled:
+            # Only installed while metrics are on: the callback runs for every statement.
+            conn.set_trace_callback(_count_statement)
+        
+        # Reap connections left behind by threads that have exited, so short-lived
+        # threads do not accumulate open file handles.
+        current = threading.current_thread()
+        with self._connections_lock:
+            alive = []
+            for thread_ref, other in self._connections:
+                thread = thread_ref()
+                if thread is not None and thread.is_alive():
+                    alive.append((thread_ref, other))
+                else:
+                    other.close()
+            alive.append((weakref.ref(current), conn))
+            self._connections = alive
+        return conn
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Returns this thread's persistent connection, opening it on first use.
+        Callers must not close it; use `close()` to release all connections.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+    
+    def close(self):
+        """
+        Closes every connection opened by this instance, in all threads. A thread that
+        uses the instance again afterwards transparently opens a new connection.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for _, conn in connections:
+            conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _init_database(self):
+        """
+        Brings the schema up to `SCHEMA_VERSION`. The version is tracked in
+        `PRAGMA user_version`, so opening an up-to-date database costs a single pragma read;
+        otherwise the pending `MIGRATIONS` run in one transaction together with the version bump.
+        The packaged database ships at `SCHEMA_VERSION` and is never migrated in place.
+        Raises:
+            RuntimeError: If the packaged database is older than `SCHEMA_VERSION`.
+        """
+        conn = self.get_connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        if self._packaged:
+            raise RuntimeError("The packaged database is out of date; reinstall uaforge "
+                               "or pass db_path to use a database of your own.")
+        
+        with self.transaction() as conn:
+            # Re-read under the write lock: another process may have migrated meanwhile.
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            for migration in MIGRATIONS[current:]:
+                migration(conn)
+            conn.execute(f"PRAGMA user_version = {max(current, SCHEMA_VERSION)}")
     
     def get_device_version(self) -> Dict[str, List[str]]:
         platforms = {}
@@ -104,7 +260,7 @@ class Database:
                     platforms[platform] = []
                 platforms[platform].append(system_info)
         finally:
-            conn.close()
+            cursor.close()
         
         return platforms
     
@@ -122,10 +278,56 @@ class Database:
                     version_types[platform] = []
                 version_types[platform].append(version_type)
         finally:
-            conn.close()
+            cursor.close()
         
         return version_types
-    
+
+    def get_catalog_data(self) -> Dict[str, Any]:
+        """
+        Reads everything the generator needs in one connection and one read transaction,
+        so the result is a consistent snapshot even if an updater is writing concurrently.
+        Returns:
+            Dict[str, Any]: Keyword arguments for `Catalog` (platforms, version_types,
+            chrome_versions, firefox_versions, opera_versions, release_dates).
+        """
+        platforms = {}
+        version_types = {}
+        release_dates = {}
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("BEGIN")
+
+            for platform, system_info in cursor.execute("SELECT platform, system_info FROM platforms"):
+                platforms.setdefault(platform, []).append(system_info)
+
+            for platform, version_type in cursor.execute("SELECT platform, version_type FROM version_types"):
+                version_types.setdefault(platform, []).append(version_type)
+
+            browser_versions = {}
+            for table in ("chrome_versions", "firefox_versions", "opera_versions"):
+                versions = browser_versions[table] = []
+                for version, release_date in cursor.execute(f"SELECT version, release_date FROM {table}"):
+                    versions.append(version)
+                    release_dates[version] = release_date
+
+            cursor.execute("COMMIT")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        return {
+            "platforms": platforms,
+            "version_types": version_types,
+            "chrome_versions": browser_versions["chrome_versions"],
+            "firefox_versions": browser_versions["firefox_versions"],
+            "opera_versions": browser_versions["opera_versions"],
+            "release_dates": release_dates,
+        }
+
     def get_chrome_vers(self) -> Tuple[List[str], List[Tuple]]:
         versions = []
         version_data = []
@@ -140,7 +342,7 @@ class Database:
                 versions.append(version)
                 version_data.append((version, release_date, last_updated))
         finally:
-            conn.close()
+            cursor.close()
         
         return (versions, version_data)
     
@@ -158,7 +360,7 @@ class Database:
                 versions.append(version)
                 version_data.append((version, release_date, last_updated))
         finally:
-            conn.close()
+            cursor.close()
         
         return (versions, version_data)
     
@@ -176,7 +378,7 @@ class Database:
                 versions.append(version)
                 version_data.append((version, release_date, last_updated))
         finally:
-            conn.close()
+            cursor.close()
         
         return (versions, version_data)
     
@@ -194,7 +396,7 @@ class Database:
                 versions.append(version)
                 version_data.append((version, release_date, last_updated))
         finally:
-            conn.close()
+            cursor.close()
         
         return (versions, version_data)
     
@@ -212,7 +414,7 @@ class Database:
                 versions.append(version)
                 version_data.append((version, release_date, last_updated))
         finally:
-            conn.close()
+            cursor.close()
         
         return (versions, version_data)
     
@@ -230,184 +432,213 @@ class Database:
                 versions.append(version)
                 version_data.append((version, release_date, last_updated))
         finally:
-            conn.close()
+            cursor.close()
         
         return (versions, version_data)
     
-    def add_chrome_versions(self, dt_add: list, dt_update: list = None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+    @property
+    def schema_version(self) -> int:
+        return self.get_connection().execute("PRAGMA user_version").fetchone()[0]
+    
+    def _check_family(self, family: str):
+        if family not in VERSION_FAMILIES:
+            raise ValueError(f"Unknown version family: {family}")
+    
+    def _legacy_version_rows(self, family: str) -> List[tuple]:
+        # Read-only databases are never migrated; emulate the `versions` columns for
+        # files still on schema 1 by parsing in Python.
+        cursor = self.get_connection().cursor()
         try:
-            for version, release_date, last_updated in dt_add:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO chrome_versions 
-                    (version, release_date, last_updated) 
-                    VALUES (?, ?, ?)
-                ''', (version, release_date, last_updated))
-            
-            if dt_update:
-                for version, release_date, last_updated in dt_update:
-                    cursor.execute('''
-                        UPDATE chrome_versions 
-                        SET release_date = ?, last_updated = ?
-                        WHERE version = ?
-                    ''', (release_date, last_updated, version))
-            
-            conn.commit()
+            cursor.execute(f"SELECT version, release_date, last_updated FROM {family}_versions")
+            return [_version_row(family, *row) for row in cursor.fetchall()]
         finally:
-            conn.close()
+            cursor.close()
     
-    def add_firefox_versions(self, dt_add: list, dt_update: list = None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+    def get_latest_versions(self, family: str, limit: int = 10) -> List[str]:
+        """
+        Returns the highest versions of a family, newest first, ordered numerically by
+        (major, minor, build, patch) rather than as text.
+        Args:
+            family (str): One of `VERSION_FAMILIES`, e.g. "chrome".
+            limit (int, optional): Maximum number of versions. Defaults to 10.
+        Returns:
+            List[str]: Stored version strings, e.g. ["Chrome/120.0.6099.109", ...].
+        Example:
+            >>> db.get_latest_versions("firefox", 3)
+        """
+        self._check_family(family)
+        if self.schema_version < 2:
+            rows = self._legacy_version_rows(family)
+            rows.sort(key=lambda row: tuple(-1 if part is None else part for part in row[2:6]), reverse=True)
+            return [row[1] for row in rows[:limit]]
+        
+        cursor = self.get_connection().cursor()
         try:
-            for version, release_date, last_updated in dt_add:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO firefox_versions 
-                    (version, release_date, last_updated) 
-                    VALUES (?, ?, ?)
-                ''', (version, release_date, last_updated))
-            
-            if dt_update:
-                for version, release_date, last_updated in dt_update:
-                    cursor.execute('''
-                        UPDATE firefox_versions 
-                        SET release_date = ?, last_updated = ?
-                        WHERE version = ?
-                    ''', (release_date, last_updated, version))
-            
-            conn.commit()
+            cursor.execute('''
+                SELECT version FROM versions WHERE family = ?
+                ORDER BY major DESC, minor DESC, build DESC, patch DESC
+                LIMIT ?
+            ''', (family, limit))
+            return [version for version, in cursor.fetchall()]
         finally:
-            conn.close()
- 
-    def add_opera_versions(self, dt_add: list, dt_update: list = None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+            cursor.close()
+    
+    def get_max_major(self, family: str) -> Optional[int]:
+        """
+        Returns the highest major version stored for a family, or None if it has none.
+        Args:
+            family (str): One of `VERSION_FAMILIES`, e.g. "opera".
+        Returns:
+            Optional[int]: The highest major version.
+        """
+        self._check_family(family)
+        if self.schema_version < 2:
+            majors = [row[2] for row in self._legacy_version_rows(family) if row[2] is not None]
+            return max(majors, default=None)
+        
+        return self.get_connection().execute(
+            "SELECT MAX(major) FROM versions WHERE family = ?", (family,)
+        ).fetchone()[0]
+    
+    def get_versions_released_since(self, family: str, since) -> List[Tuple[str, str]]:
+        """
+        Returns the versions of a family released on or after a date, oldest first.
+        Versions without a known release date are excluded.
+        Args:
+            family (str): One of `VERSION_FAMILIES`, e.g. "chrome".
+            since: A `datetime.date`/`datetime` or any string `parse_release_date` accepts.
+        Returns:
+            List[Tuple[str, str]]: (version, ISO release date) pairs.
+        Raises:
+            ValueError: If `family` or `since` is invalid.
+        """
+        self._check_family(family)
+        since_iso = _normalize_date(since)
+        if since_iso is None:
+            raise ValueError(f"Invalid date: {since}")
+        
+        if self.schema_version < 2:
+            rows = [(row[1], row[6]) for row in self._legacy_version_rows(family)
+                    if row[6] is not None and row[6] >= since_iso]
+            return sorted(rows, key=lambda row: row[1])
+        
+        cursor = self.get_connection().cursor()
         try:
-            for version, release_date, last_updated in dt_add:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO opera_versions 
-                    (version, release_date, last_updated) 
-                    VALUES (?, ?, ?)
-                ''', (version, release_date, last_updated))
-            
-            if dt_update:
-                for version, release_date, last_updated in dt_update:
-                    cursor.execute('''
-                        UPDATE opera_versions 
-                        SET release_date = ?, last_updated = ?
-                        WHERE version = ?
-                    ''', (release_date, last_updated, version))
-            
-            conn.commit()
+            cursor.execute('''
+                SELECT version, release_date FROM versions
+                WHERE family = ? AND release_date >= ?
+                ORDER BY release_date
+            ''', (family, since_iso))
+            return cursor.fetchall()
         finally:
-            conn.close()
+            cursor.close()
     
-    def add_android_versions(self, dt_add: list, dt_update: list = None):
+    @contextmanager
+    def transaction(self):
+        """
+        Runs a block inside one explicit write transaction on this thread's connection.
+        The write lock is taken up front (`BEGIN IMMEDIATE`); the block is committed when
+        it finishes and rolled back if it raises.
+        Example:
+            >>> with db.transaction() as conn:
+            ...     conn.execute("DELETE FROM platforms")
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            for version, release_date, last_updated in dt_add:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO android_versions 
-                    (version, release_date, last_updated) 
-                    VALUES (?, ?, ?)
-                ''', (version, release_date, last_updated))
-            
-            if dt_update:
-                for version, release_date, last_updated in dt_update:
-                    cursor.execute('''
-                        UPDATE android_versions 
-                        SET release_date = ?, last_updated = ?
-                        WHERE version = ?
-                    ''', (release_date, last_updated, version))
-            
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
             conn.commit()
-        finally:
-            conn.close()
     
-    def add_windows_versions(self, dt_add: list, dt_update: list = None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            for version, release_date, last_updated in dt_add:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO windows_versions 
-                    (version, release_date, last_updated) 
-                    VALUES (?, ?, ?)
-                ''', (version, release_date, last_updated))
-            
-            if dt_update:
-                for version, release_date, last_updated in dt_update:
-                    cursor.execute('''
-                        UPDATE windows_versions 
-                        SET release_date = ?, last_updated = ?
-                        WHERE version = ?
-                    ''', (release_date, last_updated, version))
+    def upsert_versions(self, table: str, rows: list, updates: list = None):
+        """
+        Writes version rows for one family in a single transaction.
+        `rows` are inserted or, if the version already exists, overwritten; `updates` only
+        touch versions that already exist. Either way a stored row is only rewritten when its
+        normalized release date actually changes. Numeric components and the ISO release date
+        are derived on the way in. Both use `executemany`, so the per-row cost stays inside SQLite.
+        Args:
+            table (str): One of `VERSION_TABLES`, e.g. "chrome_versions".
+            rows (list): (version, release_date, last_updated) tuples to upsert.
+            updates (list, optional): (version, release_date, last_updated) tuples to update.
+        Raises:
+            ValueError: If `table` is not a version table.
+        """
+        if table not in VERSION_TABLES:
+            raise ValueError(f"Unknown version table: {table}")
+        family = VERSION_FAMILIES[VERSION_TABLES.index(table)]
+        
+        with self.transaction() as conn:
+            conn.executemany('''
+                INSERT INTO versions
+                    (family, version, major, minor, build, patch, release_date, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(family, version) DO UPDATE SET
+                    release_date = excluded.release_date,
+                    last_updated = excluded.last_updated
+                WHERE release_date IS NOT excluded.release_date
+            ''', (_version_row(family, *row) for row in rows))
             
-            conn.commit()
-        finally:
-            conn.close()
- 
+            if updates:
+                conn.executemany('''
+                    UPDATE versions
+                    SET release_date = ?1, last_updated = ?2
+                    WHERE family = ?3 AND version = ?4 AND release_date IS NOT ?1
+                ''', (
+                    (_normalize_date(release_date), last_updated, family, version)
+                    for version, release_date, last_updated in updates
+                ))
+    
+    def replace_rows(self, table: str, rows: list):
+        """
+        Atomically replaces the contents of `platforms` or `version_types`.
+        The DELETE and the inserts share one transaction, so a concurrent reader sees either
+        the old rows or the new ones, never an empty table. Nothing is written if the table
+        already holds exactly these rows.
+        Args:
+            table (str): "platforms" or "version_types".
+            rows (list): (platform, value) tuples.
+        Raises:
+            ValueError: If `table` is not one of the two lookup tables.
+        """
+        if table not in LOOKUP_TABLES:
+            raise ValueError(f"Unknown lookup table: {table}")
+        platform_column, value_column = LOOKUP_TABLES[table]
+        
+        current = self.get_connection().execute(f"SELECT {platform_column}, {value_column} FROM {table}").fetchall()
+        if set(current) == set(map(tuple, rows)):
+            return
+        
+        with self.transaction() as conn:
+            conn.execute(f"DELETE FROM {table}")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({platform_column}, {value_column}) VALUES (?, ?)",
+                rows
+            )
+    
+    def add_chrome_versions(self, dt_add: list, dt_update: list = None):
+        self.upsert_versions("chrome_versions", dt_add, dt_update)
+    
+    def add_firefox_versions(self, dt_add: list, dt_update: list = None):
+        self.upsert_versions("firefox_versions", dt_add, dt_update)
+    
+    def add_opera_versions(self, dt_add: list, dt_update: list = None):
+        self.upsert_versions("opera_versions", dt_add, dt_update)
+    
+    def add_android_versions(self, dt_add: list, dt_update: list = None):
+        self.upsert_versions("android_versions", dt_add, dt_update)
+    
+    def add_windows_versions(self, dt_add: list, dt_update: list = None):
+        self.upsert_versions("windows_versions", dt_add, dt_update)
+    
     def add_macos_versions(self, dt_add: list, dt_update: list = None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            for version, release_date, last_updated in dt_add:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO macos_versions 
-                    (version, release_date, last_updated) 
-                    VALUES (?, ?, ?)
-                ''', (version, release_date, last_updated))
-            
-            if dt_update:
-                for version, release_date, last_updated in dt_update:
-                    cursor.execute('''
-                        UPDATE macos_versions 
-                        SET release_date = ?, last_updated = ?
-                        WHERE version = ?
-                    ''', (release_date, last_updated, version))
-            
-            conn.commit()
-        finally:
-            conn.close()
-               
+        self.upsert_versions("macos_versions", dt_add, dt_update)
+    
     def add_platforms(self, platforms_data: list):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("DELETE FROM platforms")
-            
-            for platform, system_info in platforms_data:
-                cursor.execute(
-                    "INSERT OR REPLACE INTO platforms (platform, system_info) VALUES (?, ?)",
-                    (platform, system_info)
-                )
-            
-            conn.commit()
-        finally:
-            conn.close()
+        self.replace_rows("platforms", platforms_data)
     
     def add_version_types(self, version_types_data: list):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("DELETE FROM version_types")
-            
-            for platform, version_type in version_types_data:
-                cursor.execute(
-                    "INSERT OR REPLACE INTO version_types (platform, version_type) VALUES (?, ?)",
-                    (platform, version_type)
-                )
-            
-            conn.commit()
-        finally:
-            conn.close()
\ No newline at end of file
+        self.replace_rows("version_types", version_types_data)
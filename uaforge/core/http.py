@@ -0,0 +1,231 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a source's circuit breaker is open."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when a request cannot complete before the client's deadline."""
+
+
+class HostLimiter:
+    """
+    HostLimiter
+    Per-host politeness limits for concurrent fetching: at most `max_concurrent` requests
+    in flight to one host, and request starts to the same host spaced at least
+    `min_interval` seconds apart. Different hosts never wait on each other.
+    Args:
+        max_concurrent (int, optional): Concurrent requests allowed per host. Defaults to 2.
+        min_interval (float, optional): Minimum seconds between request starts per host. Defaults to 0.1.
+    Example:
+        >>> limiter = HostLimiter(max_concurrent=1)
+        >>> with limiter.slot("https://en.wikipedia.org/wiki/MacOS_Sierra"):
+        ...     pass
+    """
+    
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 0.1):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._hosts = {}
+    
+    @contextmanager
+    def slot(self, url: str):
+        host = urlsplit(url).netloc
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = [threading.BoundedSemaphore(self.max_concurrent), 0.0]
+        
+        semaphore = state[0]
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, state[1])
+                state[1] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker
+    Per-source circuit breaker. After `failure_threshold` consecutive failed requests a
+    source is "open": further requests fail immediately with `CircuitOpenError` instead of
+    waiting on timeouts. After `reset_timeout` seconds one trial request is let through;
+    success closes the circuit again, failure re-opens it.
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 3.
+        reset_timeout (float, optional): Seconds before a trial request. Defaults to 60.
+    """
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+    
+    def before_request(self, source: str):
+        with self._lock:
+            opened_at = self._opened_at.get(source)
+            if opened_at is None:
+                return
+            now = time.monotonic()
+            if now - opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit open for {source}; skipping request")
+            # Half-open: let this request through and keep failing the others fast.
+            self._opened_at[source] = now
+    
+    def record_success(self, source: str):
+        with self._lock:
+            self._failures.pop(source, None)
+            self._opened_at.pop(source, None)
+    
+    def record_failure(self, source: str):
+        with self._lock:
+            failures = self._failures.get(source, 0) + 1
+            self._failures[source] = failures
+            if failures >= self.failure_threshold:
+                self._opened_at[source] = time.monotonic()
+    
+    def is_open(self, source: str) -> bool:
+        with self._lock:
+            return source in self._opened_at
+
+
+class HttpClient:
+    """
+    HttpClient
+    The shared HTTP transport for fetching version data. One pooled `requests.Session`
+    serves every source. Each request has connect/read timeouts, is retried with
+    exponential backoff and full jitter on connection errors, timeouts, 429 and 5xx
+    (honouring `Retry-After`), respects the per-host `HostLimiter`, and is guarded by a
+    per-source `CircuitBreaker`. An optional overall deadline clips every timeout and
+    backoff, so a batch of requests has a hard upper bound on its duration.
+    Args:
+        timeout (Tuple[float, float], optional): (connect, read) timeout in seconds. Defaults to (5, 30).
+        retries (int, optional): Retries after the first attempt. Defaults to 3.
+        backoff (float, optional): Base backoff in seconds, doubled per retry. Defaults to 0.5.
+        max_backoff (float, optional): Upper bound for a single backoff. Defaults to 10.
+        pool_size (int, optional): Connections kept per host (and hosts kept) in the pool. Defaults to 10.
+        limiter (HostLimiter, optional): Politeness limits. Defaults to `HostLimiter()`.
+        breaker (CircuitBreaker, optional): Circuit breaker. Defaults to `CircuitBreaker()`.
+    Example:
+        >>> client = HttpClient(timeout=(3, 10))
+        >>> client.set_deadline(120)
+        >>> response = client.get("https://www.mozilla.org/en-US/firefox/releases/")
+    """
+    
+    def __init__(self, timeout: Tuple[float, float] = (5.0, 30.0), retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 10.0, pool_size: int = 10,
+                 limiter: HostLimiter = None, breaker: CircuitBreaker = None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = limiter or HostLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.deadline = None
+        self._random = random.Random()
+        
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=max(pool_size, self.limiter.max_concurrent),
+                              max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def set_deadline(self, seconds: Optional[float]):
+        """
+        Sets an overall deadline `seconds` from now for all subsequent requests, or clears
+        it with None. Requests that cannot finish in time raise `DeadlineExceeded`.
+        """
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+    
+    def _remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("Update deadline exceeded")
+        return remaining
+    
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        delay = self._random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if response is not None:
+            try:
+                delay = max(delay, float(response.headers.get("Retry-After", 0)))
+            except ValueError:
+                pass
+        return min(delay, self.max_backoff)
+    
+    def get(self, url: str, headers: Dict[str, str] = None, source: str = None) -> requests.Response:
+        """
+        GETs `url` with timeouts, retries and circuit breaking.
+        Args:
+            url (str): The URL to fetch.
+            headers (Dict[str, str], optional): Extra request headers.
+            source (str, optional): Circuit breaker key. Defaults to the URL's host.
+        Returns:
+            requests.Response: The response. Non-retryable statuses (including 404) are
+            returned as-is; a retryable status is returned once retries are exhausted.
+        Raises:
+            CircuitOpenError: If the source's circuit is open.
+            DeadlineExceeded: If the deadline passes before the request can complete.
+            requests.RequestException: If the last attempt failed to connect or timed out.
+        """
+        source = source or urlsplit(url).netloc
+        self.breaker.before_request(source)
+        
+        attempt = 0
+        while True:
+            connect_timeout, read_timeout = self.timeout
+            try:
+                remaining = self._remaining()
+                if remaining is not None:
+                    connect_timeout, read_timeout = min(connect_timeout, remaining), min(read_timeout, remaining)
+                with self.limiter.slot(url):
+                    response = self.session.get(url, headers=headers, timeout=(connect_timeout, read_timeout))
+            except DeadlineExceeded:
+                self.breaker.record_failure(source)
+                raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success(source)
+                    return response
+                error = None
+            
+            if attempt >= self.retries:
+                self.breaker.record_failure(source)
+                if response is not None:
+                    return response
+                raise error
+            
+            delay = self._backoff_delay(attempt, response)
+            remaining = None if self.deadline is None else self.deadline - time.monotonic()
+            if remaining is not None and delay >= remaining:
+                self.breaker.record_failure(source)
+                raise DeadlineExceeded(f"Update deadline exceeded while retrying {url}")
+            time.sleep(delay)
+            attempt += 1
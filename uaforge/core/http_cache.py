@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the per-user cache directory: `$XDG_CACHE_HOME/uaforge`, falling back to
+    `~/.cache/uaforge`.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "uaforge"
+
+
+def body_digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _json_default(value):
+    # Parsed results may carry datetimes; store them as ISO strings.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class HttpCache:
+    """
+    HttpCache
+    On-disk cache for upstream pages and for what was parsed out of them.
+    For every URL the last body is kept together with its `ETag`/`Last-Modified`
+    validators, so the next request can be conditional and a 304 reuses the stored body.
+    Parsed results are stored under the SHA-256 of the body they came from, so an unchanged
+    page (whether it came back as a 304 or as an identical 200) is never parsed twice.
+    Entries are written atomically; failing to write (e.g. a read-only home directory)
+    only disables caching for that entry.
+    Args:
+        directory (str, optional): Cache root. Defaults to `default_cache_dir()`.
+    Example:
+        >>> cache = HttpCache("/tmp/uaforge-cache")
+        >>> cache.conditional_headers("https://www.mozilla.org/en-US/firefox/releases/")
+        {}
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = Path(directory) if directory else default_cache_dir()
+
+    def _url_path(self, url: str, suffix: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "http" / f"{key}{suffix}"
+
+    def _parsed_path(self, parser: str, digest: str) -> Path:
+        return self.directory / "parsed" / parser / f"{digest}.json"
+
+    def _write(self, path: Path, data: bytes):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass
+
+    def _read_json(self, path: Path) -> Optional[Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored validators for `url` ("etag", "last_modified", "digest"), or None.
+        """
+        return self._read_json(self._url_path(url, ".json"))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Returns the `If-None-Match`/`If-Modified-Since` headers for a request to `url`.
+        """
+        entry = self.entry(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._url_path(url, ".body"), "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> str:
+        """
+        Stores a 200 response body and its validators.
+        Args:
+            url (str): The requested URL.
+            headers (Dict[str, str]): The response headers.
+            body (bytes): The response body.
+        Returns:
+            str: The SHA-256 digest of the body.
+        """
+        digest = body_digest(body)
+        self._write(self._url_path(url, ".body"), body)
+        entry = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "digest": digest,
+        }
+        self._write(self._url_path(url, ".json"), json.dumps(entry).encode("utf-8"))
+        return digest
+
+    def load_parsed(self, parser: str, digest: str) -> Optional[Any]:
+        return self._read_json(self._parsed_path(parser, digest))
+
+    def store_parsed(self, parser: str, digest: str, result: Any):
+        data = json.dumps(result, default=_json_default).encode("utf-8")
+        self._write(self._parsed_path(parser, digest), data)
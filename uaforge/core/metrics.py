@@ -0,0 +1,297 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+Labels = Tuple[Tuple[str, Any], ...]
+
+
+class TimerStats(NamedTuple):
+    count: int
+    total: float
+    max: float
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    # Values keep their type (e.g. an HTTP status int); they are rendered as text on output.
+    return tuple(sorted(labels.items()))
+
+
+def format_sample(name: str, labels: Labels) -> str:
+    """
+    Renders a metric name and its labels as `name{key="value",...}`.
+    """
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+def render_prometheus(snapshot: Dict[str, Any], prefix: str = "uaforge") -> str:
+    """
+    Renders a `Metrics.snapshot()` in the Prometheus text exposition format. Counters
+    become `<prefix>_<name>_total`; timers become summaries (`_sum`, `_count`) plus a
+    `_max` gauge.
+    Args:
+        snapshot (Dict[str, Any]): The snapshot to render.
+        prefix (str, optional): Metric name prefix. Defaults to "uaforge".
+    Returns:
+        str: The exposition text, ending with a newline (empty if nothing was recorded).
+    """
+    lines = []
+    families: Dict[str, list] = {}
+    for (name, labels), value in sorted(snapshot["counters"].items()):
+        families.setdefault(name, []).append((labels, value))
+    for name, samples in families.items():
+        metric = f"{prefix}_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(f"{format_sample(metric, labels)} {value:g}" for labels, value in samples)
+
+    families = {}
+    for (name, labels), stats in sorted(snapshot["timers"].items()):
+        families.setdefault(name, []).append((labels, stats))
+    for name, samples in families.items():
+        metric = f"{prefix}_{name}"
+        lines.append(f"# TYPE {metric} summary")
+        for labels, stats in samples:
+            lines.append(f"{format_sample(metric + '_sum', labels)} {stats.total:.9g}")
+            lines.append(f"{format_sample(metric + '_count', labels)} {stats.count}")
+        lines.append(f"# TYPE {metric}_max gauge")
+        lines.extend(f"{format_sample(metric + '_max', labels)} {stats.max:.9g}" for labels, stats in samples)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict[str, Any]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Metrics:
+    """
+    Metrics
+    In-process counters and timers for the generator, the database and the updater.
+    Instrumented code checks `enabled` before doing anything else, so a disabled registry
+    (the default) costs one attribute read per call site. Values are aggregated in memory;
+    they leave the process only through `snapshot()`, `report()`, `prometheus_text()` or
+    the sinks notified by `flush()`.
+    Metrics are per process: work done in `generate_bulk` worker processes is not counted.
+    Args:
+        enabled (bool, optional): Start recording immediately. Defaults to False.
+    Example:
+        >>> from uaforge import metrics
+        >>> metrics.enable()
+        >>> UserAgentGenerator().get_list(100)
+        >>> print(metrics.report())
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._timers: Dict[Tuple[str, Labels], List[float]] = {}
+        self._sinks: List[Callable[[Dict[str, Any]], None]] = []
+
+    def enable(self, reset: bool = True):
+        """
+        Starts recording. Database connections opened before this call do not count
+        their statements.
+        Args:
+            reset (bool, optional): Clear previously recorded values. Defaults to True.
+        """
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._timers = {}
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """
+        Adds `value` to a counter. Does nothing while the registry is disabled.
+        Args:
+            name (str): Counter name, e.g. "useragents_generated".
+            value (float, optional): Amount to add. Defaults to 1.
+            **labels: Label values, e.g. `browser="Chrome"`.
+        """
+        if not self.enabled:
+            return
+        key = (name, _labels(labels) if labels else ())
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """
+        Records one duration for a timer. Does nothing while the registry is disabled.
+        Args:
+            name (str): Timer name, e.g. "catalog_load_seconds".
+            seconds (float): The measured duration.
+            **labels: Label values, e.g. `source="Chrome"`.
+        """
+        if not self.enabled:
+            return
+        key = (name, _labels(labels) if labels else ())
+        with self._lock:
+            stats = self._timers.get(key)
+            if stats is None:
+                self._timers[key] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds > stats[2]:
+                    stats[2] = seconds
+
+    def timer(self, name: str, **labels):
+        """
+        Returns a context manager that records the duration of its block with `observe`.
+        While the registry is disabled a shared no-op context manager is returned.
+        Example:
+            >>> with metrics.timer("catalog_load_seconds"):
+            ...     catalog = Catalog.from_database(db)
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns a copy of everything recorded so far.
+        Returns:
+            Dict[str, Any]: {"counters": {(name, labels): value},
+            "timers": {(name, labels): TimerStats}}, where `labels` is a sorted tuple of
+            (key, value) pairs.
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timers": {key: TimerStats(int(stats[0]), stats[1], stats[2])
+                           for key, stats in self._timers.items()},
+            }
+
+    def add_sink(self, sink: Callable[[Dict[str, Any]], None]):
+        """
+        Registers a callable that receives a `snapshot()` on every `flush()`.
+        Any function works; `LoggingSink` and `PrometheusTextSink` cover the common cases.
+        """
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[Dict[str, Any]], None]):
+        self._sinks.remove(sink)
+
+    def flush(self) -> Dict[str, Any]:
+        """
+        Passes the current snapshot to every registered sink and returns it.
+        """
+        snapshot = self.snapshot()
+        for sink in list(self._sinks):
+            sink(snapshot)
+        return snapshot
+
+    def report(self) -> str:
+        """
+        Returns a human-readable breakdown: timers (calls, total, mean, max) sorted by total
+        time, then counters.
+        """
+        snapshot = self.snapshot()
+        timers = sorted(snapshot["timers"].items(), key=lambda item: item[1].total, reverse=True)
+        counters = sorted(snapshot["counters"].items())
+        width = max([len(format_sample(name, labels)) for (name, labels), _ in timers + counters] + [40])
+        lines = []
+        if timers:
+            lines.append(f"{'timer':<{width}} {'calls':>8} {'total ms':>10} {'mean ms':>10} {'max ms':>10}")
+            for (name, labels), stats in timers:
+                lines.append(f"{format_sample(name, labels):<{width}} {stats.count:>8} {stats.total * 1000:>10.2f} "
+                             f"{stats.total / stats.count * 1000:>10.3f} {stats.max * 1000:>10.3f}")
+        if counters:
+            if lines:
+                lines.append("")
+            lines.append(f"{'counter':<{width}} {'value':>8}")
+            for (name, labels), value in counters:
+                lines.append(f"{format_sample(name, labels):<{width}} {value:>8g}")
+        return "\n".join(lines) if lines else "No metrics recorded."
+
+    def prometheus_text(self, prefix: str = "uaforge") -> str:
+        """
+        Renders the current values in the Prometheus text format (see `render_prometheus`).
+        """
+        return render_prometheus(self.snapshot(), prefix)
+
+
+class LoggingSink:
+    """
+    LoggingSink
+    A `Metrics` sink that logs one line per counter and timer on every flush.
+    Args:
+        logger (logging.Logger, optional): Target logger. Defaults to the "uaforge.metrics" logger.
+        level (int, optional): Log level. Defaults to `logging.INFO`.
+    """
+
+    def __init__(self, logger=None, level: int = None):
+        import logging
+
+        self.logger = logger or logging.getLogger("uaforge.metrics")
+        self.level = logging.INFO if level is None else level
+
+    def __call__(self, snapshot: Dict[str, Any]):
+        for (name, labels), value in sorted(snapshot["counters"].items()):
+            self.logger.log(self.level, "%s %g", format_sample(name, labels), value)
+        for (name, labels), stats in sorted(snapshot["timers"].items()):
+            self.logger.log(self.level, "%s count=%d total=%.6fs max=%.6fs",
+                            format_sample(name, labels), stats.count, stats.total, stats.max)
+
+
+class PrometheusTextSink:
+    """
+    PrometheusTextSink
+    A `Metrics` sink that atomically rewrites a Prometheus text file on every flush,
+    e.g. for node_exporter's textfile collector.
+    Args:
+        path (str): The `.prom` file to write.
+        prefix (str, optional): Metric name prefix. Defaults to "uaforge".
+    """
+
+    def __init__(self, path: str, prefix: str = "uaforge"):
+        self.path = path
+        self.prefix = prefix
+
+    def __call__(self, snapshot: Dict[str, Any]):
+        text = render_prometheus(snapshot, self.prefix)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp, self.path)
+
+
+# The process-wide registry every instrumented module reports to.
+metrics = Metrics()
@@ -0,0 +1,68 @@
+from typing import Iterator
+
+from .rng import derive_seed
+
+_MASK64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    """
+    FeistelPermutation
+    A keyed pseudo-random permutation of the integers in [0, size).
+    An (unbalanced) Feistel network permutes the smallest bit domain covering `size`;
+    values that land outside [0, size) are re-encrypted until they fall inside ("cycle
+    walking"), which keeps the mapping a bijection on [0, size). The bit domain is less
+    than twice `size`, so a lookup needs fewer than two passes on average and no state
+    beyond the round keys. Each round function is a keyed multiply-high, which scrambles
+    well enough for sampling (this is not a cryptographic permutation).
+    Attributes:
+        size (int): The number of elements being permuted.
+    Example:
+        >>> perm = FeistelPermutation(10, seed=1)
+        >>> sorted(perm) == list(range(10))
+        True
+    """
+
+    def __init__(self, size: int, seed: int, rounds: int = 4):
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+        bits = max((size - 1).bit_length(), 2)
+        left_bits, right_bits = bits // 2, bits - bits // 2
+
+        self.size = size
+        self._right_bits = right_bits
+        self._right_mask = (1 << right_bits) - 1
+
+        # Halves swap widths every round; precompute each round's key, odd multiplier
+        # and the shift that keeps the top `left_bits` bits of the 64-bit product.
+        round_params = []
+        for round_index in range(rounds):
+            key = derive_seed(seed, round_index)
+            multiplier = derive_seed(seed, round_index, 1) | 1
+            round_params.append((key, multiplier, 64 - left_bits))
+            left_bits, right_bits = right_bits, left_bits
+        self._rounds = tuple(round_params)
+        self._final_right_bits = right_bits
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._right_bits, value & self._right_mask
+        for key, multiplier, shift in self._rounds:
+            left, right = right, left ^ ((((right ^ key) * multiplier) & _MASK64) >> shift)
+        return (left << self._final_right_bits) | right
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        size = self.size
+        encrypt = self._encrypt
+        value = encrypt(index)
+        while value >= size:
+            value = encrypt(value)
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        for index in range(self.size):
+            yield self[index]
@@ -0,0 +1,278 @@
+import heapq
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+from typing import Callable, Dict, Iterator, Optional
+
+from .user_agent import UserAgentGenerator
+
+READY = "ready"
+IN_USE = "in_use"
+COOLING = "cooling"
+
+# Draws attempted for one replacement before giving up and letting the pool shrink.
+MAX_REPLACEMENT_DRAWS = 1000
+
+
+class PoolExhaustedError(LookupError):
+    """Raised when no user agent becomes available within the requested timeout."""
+
+
+class _Entry:
+    __slots__ = ("state", "uses")
+
+    def __init__(self):
+        self.state = READY
+        self.uses = 0
+
+
+class UserAgentPool:
+    """
+    UserAgentPool
+    A rotating working set of unique user agents for scraping workloads.
+    The pool pre-generates `size` distinct user agents, mixed across browsers by their
+    sampling weights like replacements are, and hands them out in rotation:
+    `acquire()` returns the agent that has been idle the longest and `release()` puts it
+    back, optionally after a cooldown, so the same agent is not reused back-to-back. Agents
+    that hit `max_uses` or are reported with `mark_bad()` are retired for good and replaced
+    by fresh agents the pool has never handed out.
+    Ready agents sit in a deque and cooling agents in a heap keyed by the time they become
+    ready again; a dict holds each agent's state and use count. Retiring an agent only
+    drops its dict entry, and stale deque/heap entries are skipped when they surface (lazy
+    deletion). `acquire()`, `release()` and `mark_bad()` are therefore O(1), or O(log n)
+    when a cooldown heap is involved, at any pool size. All methods are thread-safe.
+    Args:
+        size (int): Number of agents in the working set.
+        generator (UserAgentGenerator, optional): Where agents come from. Defaults to
+            `shared_generator()`.
+        browser (str, optional): Only use this browser's agents. Defaults to all browsers.
+        cooldown (float, optional): Seconds a released agent rests before it can be acquired
+            again. Defaults to 0.
+        max_uses (int, optional): Retire an agent after this many acquisitions. Defaults to
+            None (unlimited).
+        clock (Callable[[], float], optional): Monotonic time source for cooldowns and
+            `acquire()` timeouts. Defaults to `time.monotonic`. Blocking waits still sleep in
+            real time (with the duration measured on this clock), so with a fake clock
+            advance it and call `acquire()` with the default timeout of 0 instead of waiting.
+    Raises:
+        ValueError: If an argument is out of range or the catalog cannot produce `size`
+            distinct agents.
+    Example:
+        >>> pool = UserAgentPool(1000, cooldown=30, max_uses=50)
+        >>> with pool.lease() as ua:
+        ...     response = session.get(url, headers={"User-Agent": ua})
+        ...     if response.status_code == 403:
+        ...         pool.mark_bad(ua)
+    """
+
+    def __init__(self, size: int, generator: Optional[UserAgentGenerator] = None, browser: str = None,
+                 cooldown: float = 0.0, max_uses: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+        if cooldown < 0:
+            raise ValueError(f"cooldown must be non-negative, got {cooldown}")
+        if max_uses is not None and max_uses <= 0:
+            raise ValueError(f"max_uses must be positive, got {max_uses}")
+        if generator is None:
+            from .shared import shared_generator
+            generator = shared_generator()
+
+        self.generator = generator
+        self.browser = browser
+        self.cooldown = cooldown
+        self.max_uses = max_uses
+        self.clock = clock
+
+        self._entries: Dict[str, _Entry] = {}
+        self._ready = deque()
+        self._cooling = []
+        self._sequence = count()
+        self._retired = set()
+        self._in_use = 0
+        self._cooling_count = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._draws = generator.iter_useragents(browser)
+
+        # get_list splits the working set by browser weight, the same mix `_draws` replaces from.
+        for user_agent in generator.get_list(size, browser):
+            self._entries[user_agent] = _Entry()
+            self._ready.append(user_agent)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_agent: str) -> bool:
+        return user_agent in self._entries
+
+    def _promote_cooled(self, now: float):
+        cooling = self._cooling
+        while cooling and cooling[0][0] <= now:
+            _, _, user_agent = heapq.heappop(cooling)
+            entry = self._entries.get(user_agent)
+            if entry is not None and entry.state == COOLING:
+                entry.state = READY
+                self._cooling_count -= 1
+                self._ready.append(user_agent)
+
+    def _pop_ready(self) -> Optional[str]:
+        ready = self._ready
+        while ready:
+            user_agent = ready.popleft()
+            entry = self._entries.get(user_agent)
+            if entry is not None and entry.state == READY:
+                entry.state = IN_USE
+                entry.uses += 1
+                self._in_use += 1
+                return user_agent
+        return None
+
+    def _next_ready_in(self, now: float) -> Optional[float]:
+        # Seconds until the earliest live cooling agent is ready; stale heap heads are dropped.
+        cooling = self._cooling
+        while cooling:
+            ready_at, _, user_agent = cooling[0]
+            entry = self._entries.get(user_agent)
+            if entry is not None and entry.state == COOLING:
+                return max(0.0, ready_at - now)
+            heapq.heappop(cooling)
+        return None
+
+    def acquire(self, timeout: Optional[float] = 0.0) -> str:
+        """
+        Takes the least recently used ready agent out of the pool.
+        Args:
+            timeout (float, optional): Seconds to wait for an agent to be released or to
+                finish cooling down. 0 (the default) does not wait; None waits indefinitely.
+        Returns:
+            str: The user agent. Hand it back with `release()` or `mark_bad()`.
+        Raises:
+            PoolExhaustedError: If no agent became available in time.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._available:
+            while True:
+                now = self.clock()
+                self._promote_cooled(now)
+                user_agent = self._pop_ready()
+                if user_agent is not None:
+                    return user_agent
+
+                wait = self._next_ready_in(now)
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No user agent available ({self._in_use} in use, {self._cooling_count} cooling)")
+                    wait = remaining if wait is None else min(wait, remaining)
+                elif wait is None and not self._in_use:
+                    raise PoolExhaustedError("The pool is empty: every user agent has been retired")
+                self._available.wait(wait)
+
+    def release(self, user_agent: str, cooldown: Optional[float] = None):
+        """
+        Returns an acquired agent to the pool. It is retired and replaced instead once it
+        has reached `max_uses`.
+        Args:
+            user_agent (str): An agent obtained from `acquire()`.
+            cooldown (float, optional): Rest period for this release, e.g. longer after a
+                rate-limited response. Defaults to the pool's `cooldown`.
+        Raises:
+            ValueError: If the agent is not currently acquired from this pool.
+        """
+        with self._available:
+            entry = self._entries.get(user_agent)
+            if entry is None or entry.state != IN_USE:
+                raise ValueError(f"User agent is not acquired from this pool: {user_agent}")
+            self._in_use -= 1
+
+            if self.max_uses is not None and entry.uses >= self.max_uses:
+                self._retire(user_agent)
+            else:
+                cooldown = self.cooldown if cooldown is None else cooldown
+                if cooldown > 0:
+                    entry.state = COOLING
+                    self._cooling_count += 1
+                    heapq.heappush(self._cooling, (self.clock() + cooldown, next(self._sequence), user_agent))
+                else:
+                    entry.state = READY
+                    self._ready.append(user_agent)
+            self._available.notify()
+
+    def mark_bad(self, user_agent: str):
+        """
+        Retires an agent (for example one a target has started blocking) and adds a fresh
+        replacement. Works whether the agent is currently acquired or idle; retired agents
+        are never handed out again.
+        Args:
+            user_agent (str): The agent to retire.
+        Raises:
+            ValueError: If the agent is not part of the pool.
+        """
+        with self._available:
+            entry = self._entries.get(user_agent)
+            if entry is None:
+                raise ValueError(f"User agent is not part of this pool: {user_agent}")
+            if entry.state == IN_USE:
+                self._in_use -= 1
+            elif entry.state == COOLING:
+                self._cooling_count -= 1
+            self._retire(user_agent)
+            self._available.notify()
+
+    def _retire(self, user_agent: str):
+        # Any deque or heap entry left behind is skipped lazily once its dict entry is gone.
+        del self._entries[user_agent]
+        self._retired.add(user_agent)
+
+        for _ in range(MAX_REPLACEMENT_DRAWS):
+            candidate = next(self._draws)
+            if candidate not in self._entries and candidate not in self._retired:
+                self._entries[candidate] = _Entry()
+                self._ready.append(candidate)
+                return
+        # The catalog is (nearly) exhausted; run with one agent fewer.
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = 0.0, cooldown: Optional[float] = None) -> Iterator[str]:
+        """
+        Acquires an agent for the duration of a `with` block and releases it afterwards,
+        unless it was retired with `mark_bad()` inside the block.
+        Args:
+            timeout (float, optional): As for `acquire()`.
+            cooldown (float, optional): As for `release()`.
+        """
+        user_agent = self.acquire(timeout)
+        try:
+            yield user_agent
+        finally:
+            with self._lock:
+                entry = self._entries.get(user_agent)
+                held = entry is not None and entry.state == IN_USE
+            if held:
+                self.release(user_agent, cooldown)
+
+    def uses(self, user_agent: str) -> int:
+        """
+        Returns how many times an agent has been acquired, or 0 if it is not in the pool.
+        """
+        with self._lock:
+            entry = self._entries.get(user_agent)
+            return entry.uses if entry is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the pool's current counts: "size", "in_use", "cooling", "ready" and "retired".
+        """
+        with self._lock:
+            self._promote_cooled(self.clock())
+            return {
+                "size": len(self._entries),
+                "in_use": self._in_use,
+                "cooling": self._cooling_count,
+                "ready": len(self._entries) - self._in_use - self._cooling_count,
+                "retired": len(self._retired),
+            }
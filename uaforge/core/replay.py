@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Validators are dropped when recording so fixtures always hold full 200/404 bodies,
+# whatever the state of the HTTP cache.
+_CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ReplayMissError(requests.ConnectionError):
+    """Raised in replay mode for a request that has no recorded fixture."""
+
+
+class FixtureStore:
+    """
+    FixtureStore
+    A directory of recorded HTTP responses, one `<key>.json` (URL, status, headers) and
+    one `<key>.body` per URL, where the key is derived from the URL. Fixtures are plain
+    files so they can be committed, diffed and edited by hand.
+    Args:
+        directory (str): The fixture directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+    def save(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key = self._key(url)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {name: headers[name] for name in _KEPT_HEADERS if name in headers},
+        }
+        for suffix, data in ((".body", body), (".json", json.dumps(meta, indent=2).encode("utf-8"))):
+            fd, tmp = tempfile.mkstemp(dir=str(self.directory), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, self.directory / f"{key}{suffix}")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the recorded {"url", "status", "headers", "body"} for `url`, or None.
+        """
+        key = self._key(url)
+        try:
+            with open(self.directory / f"{key}.json", "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            with open(self.directory / f"{key}.body", "rb") as handle:
+                meta["body"] = handle.read()
+        except OSError:
+            return None
+        return meta
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    RecordingAdapter
+    A pass-through transport adapter that saves every response it receives into a
+    `FixtureStore`. Conditional request headers are stripped first, so recordings hold
+    complete pages.
+    Args:
+        store (FixtureStore): Where responses are saved.
+    """
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        for name in _CONDITIONAL_HEADERS:
+            request.headers.pop(name, None)
+        response = super().send(request, **kwargs)
+        self.store.save(request.url, response.status_code, response.headers, response.content)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    ReplayAdapter
+    A local stand-in transport that answers requests from a `FixtureStore` without any
+    network access. A request without a fixture raises `ReplayMissError`, so changes in
+    what the fetchers request show up instead of passing silently.
+    Args:
+        store (FixtureStore): The recorded responses.
+    """
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        fixture = self.store.load(request.url)
+        if fixture is None:
+            raise ReplayMissError(f"No recorded fixture for {request.url}", request=request)
+
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.headers = CaseInsensitiveDict(fixture["headers"])
+        response._content = fixture["body"]
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        pass
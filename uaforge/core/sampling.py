@@ -0,0 +1,127 @@
+import random
+from typing import Dict, Mapping, Optional, Sequence
+
+from .versions import parse_release_date
+
+
+class AliasTable:
+    """
+    AliasTable
+    Walker/Vose alias table for O(1) sampling from a fixed discrete distribution.
+    Construction is O(n). Each draw uses a single uniform random number: its integer
+    part picks a column and its fractional part decides between the column and its alias.
+    Attributes:
+        size (int): Number of outcomes.
+        prob (Tuple[float, ...]): Probability of keeping each column.
+        alias (Tuple[int, ...]): The outcome used when a column is not kept.
+    Example:
+        >>> table = AliasTable([70, 20, 10])
+        >>> table.sample(random.Random(1)) in (0, 1, 2)
+        True
+    """
+
+    __slots__ = ("size", "prob", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        size = len(weights)
+        total = float(sum(weights))
+        if size and (total <= 0 or any(weight < 0 for weight in weights)):
+            raise ValueError("weights must be non-negative and not all zero")
+
+        prob = [1.0] * size
+        alias = list(range(size))
+        scaled = [weight * size / total for weight in weights] if size else []
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            lower, upper = small.pop(), large.pop()
+            prob[lower] = scaled[lower]
+            alias[lower] = upper
+            scaled[upper] -= 1.0 - scaled[lower]
+            (small if scaled[upper] < 1.0 else large).append(upper)
+
+        # Whatever remains is 1.0 up to rounding error.
+        self.size = size
+        self.prob = tuple(prob)
+        self.alias = tuple(alias)
+
+    @classmethod
+    def uniform(cls, size: int) -> "AliasTable":
+        return cls([1.0] * size)
+
+    def sample(self, rng: random.Random) -> int:
+        u = rng.random() * self.size
+        index = int(u)
+        if u - index >= self.prob[index]:
+            return self.alias[index]
+        return index
+
+
+class Weights:
+    """
+    Weights
+    Optional sampling weights for the generator. Every weight defaults to 1, so an empty
+    `Weights()` reproduces the uniform behaviour. Weights are relative within their level:
+    a platform key is chosen by `platforms`, then a system within that key (also looked
+    up in `platforms`, by system string), a version type by `version_types`, and finally
+    a browser version by `versions` and/or recency.
+    Args:
+        browsers (Mapping[str, float], optional): "Chrome"/"Firefox"/"Opera" to weight, used
+            when no browser is requested explicitly.
+        platforms (Mapping[str, float], optional): Platform key (e.g. "Windows") or system
+            string (e.g. "Windows NT 10.0") to weight.
+        version_types (Mapping[str, float], optional): Version type (e.g. "Win64; x64") to weight.
+        versions (Mapping[str, float], optional): Stored version (e.g. "Chrome/120.0.0.0") to weight.
+        recency_half_life_days (float, optional): Halve a version's weight for every this many
+            days it was released before the newest version of the same browser. Versions
+            without a parseable release date get the smallest dated weight.
+    Example:
+        >>> weights = Weights(platforms={"Windows": 70, "Mac": 15, "Linux": 5, "Android": 10},
+        ...                   recency_half_life_days=180)
+        >>> generator = UserAgentGenerator(weights=weights)
+    """
+
+    def __init__(self, browsers: Mapping[str, float] = None, platforms: Mapping[str, float] = None,
+                 version_types: Mapping[str, float] = None, versions: Mapping[str, float] = None,
+                 recency_half_life_days: Optional[float] = None):
+        self.browsers = dict(browsers or {})
+        self.platforms = dict(platforms or {})
+        self.version_types = dict(version_types or {})
+        self.versions = dict(versions or {})
+        self.recency_half_life_days = recency_half_life_days
+
+    def browser_weight(self, browser: str) -> float:
+        return self.browsers.get(browser, 1.0)
+
+    def platform_weight(self, platform: str) -> float:
+        return self.platforms.get(platform, 1.0)
+
+    def system_weight(self, system: str) -> float:
+        return self.platforms.get(system, 1.0)
+
+    def version_type_weight(self, version_type: str) -> float:
+        return self.version_types.get(version_type, 1.0)
+
+    def version_weights(self, versions: Sequence[str],
+                        release_dates: Mapping[str, object]) -> Dict[str, float]:
+        """
+        Computes the weight of every version in one browser's version list, combining the
+        explicit `versions` table with the recency decay.
+        """
+        weights = {version: self.versions.get(version, 1.0) for version in versions}
+        half_life = self.recency_half_life_days
+        if not half_life:
+            return weights
+
+        dates = {version: parse_release_date(release_dates.get(version)) for version in versions}
+        known = [date for date in dates.values() if date is not None]
+        if not known:
+            return weights
+
+        newest = max(known)
+        oldest_factor = 0.5 ** ((newest - min(known)).days / half_life)
+        for version, date in dates.items():
+            factor = oldest_factor if date is None else 0.5 ** ((newest - date).days / half_life)
+            weights[version] *= factor
+        return weights
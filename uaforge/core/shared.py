@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+from .catalog import Catalog
+from .metrics import metrics
+from .sampling import Weights
+from .user_agent import UserAgentGenerator
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class SharedUserAgentGenerator(UserAgentGenerator):
+    """
+    SharedUserAgentGenerator
+    A long-lived `UserAgentGenerator` that follows changes to its database.
+    A daemon thread checks the database every `poll_interval` seconds. The check is one
+    `os.stat` plus `PRAGMA data_version` on a dedicated connection, so it sees commits
+    from any process (such as a cron job running `uaforge --update all`) as well as the
+    file being replaced. When something changed, the thread loads a new catalog and swaps
+    it in with a single attribute assignment. Generating threads are never blocked and
+    always see either the old catalog or the new one, never a partially loaded state.
+    One instance is safe to use from many threads: generation reads the catalog reference
+    once per call and otherwise only touches the RNG, whose methods are atomic.
+    Children created with `spawn()` share the current catalog but do not follow reloads.
+    Args:
+        db_path (str, optional): Database to follow. Defaults to the packaged database.
+        weights (Weights, optional): Sampling weights. Defaults to uniform.
+        poll_interval (float, optional): Seconds between change checks. Defaults to 1.0.
+    Example:
+        >>> generator = SharedUserAgentGenerator()
+        >>> generator.create_useragent("Firefox")
+        >>> generator.close()
+    """
+
+    def __init__(self, db_path: str = None, weights: Optional[Weights] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        if poll_interval <= 0:
+            raise ValueError(f"poll_interval must be positive, got {poll_interval}")
+        self.db_path = db_path
+        self._db = None
+        self.poll_interval = poll_interval
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._watch_inode = None
+        # Taken before the first load, so a change landing during the load is caught by
+        # the next check instead of being missed.
+        self._signature = self._read_signature()
+        super().__init__(db_path, weights=weights)
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="uaforge-catalog-reload", daemon=True)
+        self._thread.start()
+
+    def _read_signature(self) -> Tuple:
+        stat = os.stat(self.db.db_path)
+        inode = (stat.st_dev, stat.st_ino)
+        if self._watch_conn is None or inode != self._watch_inode:
+            # A replaced file needs a new connection: the old one keeps reading the old inode.
+            if self._watch_conn is not None:
+                self._watch_conn.close()
+            self._watch_conn = self.db._open()
+            self._watch_inode = inode
+        data_version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        return inode, stat.st_mtime_ns, data_version
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                signature = self._read_signature()
+                if signature == self._signature:
+                    continue
+                if signature[0] != self._signature[0]:
+                    self.db.close()
+                self.catalog = Catalog.from_database(self.db, self.weights)
+            except (OSError, sqlite3.Error):
+                # Keep serving the current catalog; the next check retries.
+                metrics.increment("catalog_reload_errors")
+                continue
+            self._signature = signature
+            metrics.increment("catalog_reloads")
+
+    def close(self):
+        """
+        Stops the reload thread and closes the database connections. The generator keeps
+        working on its last catalog.
+        """
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._watch_conn is not None:
+            self._watch_conn.close()
+            self._watch_conn = None
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_shared: Optional[SharedUserAgentGenerator] = None
+_shared_lock = threading.Lock()
+
+
+def shared_generator() -> SharedUserAgentGenerator:
+    """
+    Returns the process-wide `SharedUserAgentGenerator` for the packaged database,
+    creating it on first use. `generate_user_agent`, `generate_multiple` and
+    `iter_user_agents` all draw from it.
+    Returns:
+        SharedUserAgentGenerator: The shared generator.
+    """
+    global _shared
+    generator = _shared
+    if generator is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SharedUserAgentGenerator()
+            generator = _shared
+    return generator
+
+
+def _reset_after_fork():
+    # The reload thread does not survive fork(); let the child build its own instance.
+    global _shared, _shared_lock
+    _shared = None
+    _shared_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,6 +1,29 @@
 import random
-from typing import List, Optional
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterator, List, Optional
 from .database import Database
+from .catalog import BROWSERS, Catalog
+from .metrics import metrics
+from .permutation import FeistelPermutation
+from .rng import make_rng, spawn_seeds
+from .sampling import AliasTable, Weights
+
+# Unique iteration stops after this many duplicate draws in a row, so a catalog whose
+# remaining combinations are (nearly) unreachable cannot make it spin forever.
+MAX_CONSECUTIVE_DUPLICATES = 100_000
+
+
+def iter_permutation(catalog: Catalog, permutation: FeistelPermutation, start: int, stop: int,
+                     browser: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields the user agents at permutation positions [start, stop). Disjoint position
+    ranges of the same permutation never share a user agent, which lets several workers
+    split one unique sample between them.
+    """
+    useragent_at = catalog.useragent_at
+    for position in range(start, stop):
+        yield useragent_at(permutation[position], browser)
 
 class UserAgentGenerator:
     """
@@ -12,8 +35,17 @@ class UserAgentGenerator:
     - Chrome (including iOS variant CriOS)
     - Firefox (including iOS variant FxiOS)
     - Opera
+    All data is sampled from an immutable in-memory `Catalog` loaded once at construction,
+    so generating a user agent does not touch the database. Call `refresh()` to reload it.
+    Randomness comes from an RNG owned by the instance: pass `seed` for reproducible output
+    or `rng` to supply one, and use `spawn()` to get independent generators for threads.
+    Pass `weights` to bias browsers, platforms, version types and versions (for example
+    towards recent releases); they are compiled into alias tables when the catalog loads.
     Attributes:
-        db (Database): Database instance for retrieving browser versions and platform information.
+        db (Database): Read-only database instance the catalog is loaded from (opened on first use).
+        catalog (Catalog): The in-memory snapshot used for generation.
+        rng (random.Random): The random number generator owned by this instance.
+        weights (Weights): Sampling weights, or None for uniform sampling.
         platform_list (dict): Dictionary mapping platform keys to available systems/versions.
         CHROME_VERS (list): List of available Chrome browser versions.
         OPERA_VERS (list): List of available Opera browser versions.
@@ -24,178 +56,360 @@ class UserAgentGenerator:
         >>> firefox_agent = generator.create_useragent("Firefox")
         >>> agents_list = generator.get_list(10)
     """    
-    def __init__(self, db_path: str = None):
-        self.db = Database(db_path)
-        self._initialize_data()
-    
-    def _initialize_data(self):
-        """
-        Initializes user agent data by retrieving platform and browser version information from the database.
+    def __init__(self, db_path: str = None, catalog: Optional[Catalog] = None,
+                 seed: Optional[int] = None, rng: Optional[random.Random] = None,
+                 weights: Optional[Weights] = None):
+        self.db_path = db_path
+        self._db = None
+        self.weights = weights if weights is not None or catalog is None else catalog.weights
+        self.catalog = catalog if catalog is not None else Catalog.from_database(self.db, self.weights)
+        self.rng = make_rng(seed, rng)
 
-        This method sets the following instance attributes:
-            - platform_list: List of device platforms and versions.
-            - CHROME_VERS: Latest Chrome browser version.
-            - OPERA_VERS: Latest Opera browser version.
-            - FIREFOX_VERS: Latest Firefox browser version.
+    def spawn(self, n: int) -> List["UserAgentGenerator"]:
         """
-        self.platform_list = self.db.get_device_version()
-        self.CHROME_VERS = self.db.get_chrome_vers()[0]
-        self.OPERA_VERS = self.db.get_opera_vers()[0]
-        self.FIREFOX_VERS = self.db.get_firefox_vers()[0]
-    
-    def _select_random_platform(self) -> tuple:
+        Creates `n` child generators with independent RNG streams.
+        Children share this generator's catalog (it is immutable) but own their RNG, so
+        they can be used from separate threads without contending on shared state. When
+        this generator was seeded, the children are reproducible too.
+        Args:
+            n (int): Number of child generators.
+        Returns:
+            List[UserAgentGenerator]: The child generators.
+        Example:
+            >>> workers = UserAgentGenerator(seed=42).spawn(4)
         """
-        Selects a random platform, system, and version type.
-        This method randomly chooses a platform key from the available platforms,
-        then selects a random system associated with that platform. It also retrieves
-        the available version types from the database and selects a random version type
-        corresponding to the chosen platform.
+        return [UserAgentGenerator(self.db_path, catalog=self.catalog, seed=seed)
+                for seed in spawn_seeds(self.rng, n)]
+
+    @property
+    def db(self) -> Database:
+        if self._db is None:
+            self._db = Database(self.db_path, readonly=True)
+        return self._db
+
+    @property
+    def platform_list(self):
+        return self.catalog.platforms
+
+    @property
+    def CHROME_VERS(self):
+        return self.catalog.chrome_versions
+
+    @property
+    def OPERA_VERS(self):
+        return self.catalog.opera_versions
+
+    @property
+    def FIREFOX_VERS(self):
+        return self.catalog.firefox_versions
+
+    def refresh(self) -> Catalog:
+        """
+        Reloads the catalog from the database and swaps it in.
+        Generation never reads the database on its own, so call this after updating
+        versions to make the new data visible to this generator.
         Returns:
-            tuple: A tuple containing:
-                - select_key (str): The randomly selected platform key.
-                - system_select (str): The randomly selected system for the platform.
-                - type_select (str): The randomly selected version type for the platform.
-        """
-        select_key = random.choice(list(self.platform_list.keys()))
-        system_select = random.choice(self.platform_list[select_key])
-        
-        version_types = self.db.get_version_type_connect()
-        type_select = random.choice(version_types.get(select_key, [""]))
-        
-        return select_key, system_select, type_select
+            Catalog: The newly loaded catalog.
+        """
+        self.catalog = Catalog.from_database(self.db, self.weights)
+        return self.catalog
     
     def create_useragent(self, browser_type: str = "Chrome") -> str:
         """
         Generates a user agent string for the specified browser type.
+        The platform, system and version type are fixed by a template compiled when the
+        catalog was loaded (including the iOS CriOS/FxiOS rewrites), so this costs one
+        template pick, one version pick and one concatenation. Every pick is an O(1)
+        alias-table draw, so weighted sampling costs the same as uniform sampling.
         Args:
             browser_type (str, optional): The type of browser for which to generate the user agent.
                 Supported values are "Chrome", "Firefox", and "Opera". Defaults to "Chrome".
         Returns:
             str: A user agent string corresponding to the specified browser type and a randomly selected platform.
         Raises:
-            ValueError: If an unsupported browser type is provided.
-        """
-        select_key, system_select, type_select = self._select_random_platform()
-        
-        if browser_type == "Chrome":
-            return self._create_chrome_agent(select_key, system_select, type_select)
-        elif browser_type == "Firefox":
-            return self._create_firefox_agent(select_key, system_select, type_select)
-        elif browser_type == "Opera":
-            return self._create_opera_agent(select_key, system_select, type_select)
-        else:
-            raise ValueError(f"Desteklenmeyen tarayıcı tipi: {browser_type}")
+            ValueError: If an unsupported browser type is provided, or the database holds no
+                versions for it.
+        """
+        return self._create_useragent(self.catalog, browser_type)
+
+    def _create_useragent(self, catalog: Catalog, browser_type: str) -> str:
+        # Multi-agent calls pass the catalog they read once, so a reload swapped in by
+        # `SharedUserAgentGenerator` mid-call cannot mix two catalogs.
+        try:
+            templates = catalog.templates[browser_type]
+        except KeyError:
+            if browser_type in BROWSERS:
+                raise ValueError(f"No {browser_type} versions available (none stored, or all weighted 0). "
+                                 "Run '--update all' to fetch them.") from None
+            raise ValueError(f"Desteklenmeyen tarayıcı tipi: {browser_type}") from None
+
+        # AliasTable.sample, inlined: this is the hottest path in the package.
+        random = self.rng.random
+        table = catalog.template_table
+        u = random() * table.size
+        index = int(u)
+        template = templates[index if u - index < table.prob[index] else table.alias[index]]
+
+        table = template.version_table
+        u = random() * table.size
+        index = int(u)
+        user_agent = (template.prefix + template.versions[index if u - index < table.prob[index] else table.alias[index]]
+                      + template.suffix)
+
+        if template.extra:
+            table = template.extra_table
+            u = random() * table.size
+            index = int(u)
+            user_agent += template.extra[index if u - index < table.prob[index] else table.alias[index]]
+        if metrics.enabled:
+            metrics.increment("useragents_generated", browser=browser_type)
+        return user_agent
     
-    def _create_chrome_agent(self, select_key: str, system_select: str, type_select: str) -> str:
+    def cardinality(self, browser: str = None) -> int:
         """
-        Generates a Chrome-based User-Agent string based on the provided system and type selections.
+        Returns how many distinct user agents the current catalog can produce.
         Args:
-            system_select (str): The system information string (e.g., OS and device type).
-            type_select (str): The type information string (e.g., locale or device type).
+            browser (str, optional): Restrict the count to one browser. Defaults to all browsers.
         Returns:
-            str: A formatted User-Agent string for Chrome or Chrome on iOS devices.
-        Notes:
-            - If the system is identified as an iPhone or iPad, the User-Agent is formatted to mimic Chrome on iOS (CriOS).
-            - Otherwise, a standard Chrome User-Agent string is generated.
-        """
-        Moz = "Mozilla"
-        Mozilla_vers = "5.0"
-        
-        if "iPhone" in system_select or "iPad" in system_select:
-            if "iPad" in system_select:
-                system_select = system_select.strip(";").replace("Intel Mac OS X", "CPU OS") + " like Mac OS X"
-            else:
-                system_select = system_select.strip(";").replace("Intel Mac OS X", "CPU iPhone OS") + " like Mac OS X"
-            
-            CHROME_VERS_SELECT = str(random.choice(self.CHROME_VERS)).replace("Chrome", "CriOS")
-            return f"{Moz}/{Mozilla_vers} ({system_select}; {type_select}) AppleWebKit/605.1.15 (KHTML, like Gecko) {CHROME_VERS_SELECT} Mobile/15E148 Safari/604.1"
-        else:
-            CHROME_VERS_SELECT = random.choice(self.CHROME_VERS)
-            return f"{Moz}/{Mozilla_vers} ({system_select}; {type_select}) AppleWebKit/537.36 (KHTML, like Gecko) {CHROME_VERS_SELECT} Safari/537.36"
+            int: The number of distinct user agent strings.
+        """
+        return self.catalog.cardinality(browser)
     
-    def _create_firefox_agent(self, select_key: str, system_select: str, type_select: str) -> str:
+    def useragent_at(self, index: int, browser: str = None) -> str:
+        """
+        Returns the `index`-th distinct user agent of the catalog's combination space.
+        See `Catalog.useragent_at` for the numbering.
         """
-        Generates a Firefox user agent string based on the provided system and type selections.
+        return self.catalog.useragent_at(index, browser)
+
+    def sample_unique(self, n: int, browser: str = None) -> Iterator[str]:
+        """
+        Lazily yields `n` distinct user agents, sampled uniformly without replacement.
+        Instead of drawing and deduplicating, this walks a keyed pseudo-random permutation
+        of the catalog's numbered combination space (see `cardinality()`), decoding each
+        position on the fly. Output is exactly unique with no seen-set, memory stays
+        constant, and the cost per agent does not grow as `n` approaches the cardinality.
+        Sampling weights do not apply here: every combination is equally likely.
         Args:
-            system_select (str): The system information to include in the user agent (e.g., "Windows NT 10.0", "iPhone", "iPad").
-            type_select (str): The type or locale information to include in the user agent (e.g., "en-US").
+            n (int): The number of user agents to yield.
+            browser (str, optional): Restrict sampling to one browser. Defaults to all browsers.
         Returns:
-            str: A formatted Firefox user agent string tailored to the specified system and type.
-        Notes:
-            - For iPhone and iPad systems, the user agent is formatted to mimic Firefox on iOS (FxiOS).
-            - For other systems, a standard Firefox user agent string is generated.
-            - The Firefox version is randomly selected from the self.FIREFOX_VERS list.
-        """
-        Moz = "Mozilla"
-        Mozilla_vers = "5.0"
-        
-        if "iPhone" in system_select or "iPad" in system_select:
-            if "iPad" in system_select:
-                system_select = system_select.strip(";").replace("Intel Mac OS X", "CPU OS") + " like Mac OS X"
+            Iterator[str]: An iterator of `n` distinct user agent strings.
+        Raises:
+            ValueError: If the browser is unsupported, `n` is negative, or `n` exceeds the
+                number of distinct user agents available.
+        Example:
+            >>> agents = list(generator.sample_unique(100_000))
+        """
+        catalog = self.catalog
+        self._resolve_browsers(catalog, browser)
+        if n < 0:
+            raise ValueError(f"n must be non-negative, got {n}")
+        self._check_capacity(catalog, browser, n)
+        return self._sample_unique(catalog, n, browser)
+
+    def _sample_unique(self, catalog: Catalog, n: int, browser: Optional[str]) -> Iterator[str]:
+        if n == 0:
+            return iter(())
+        if metrics.enabled:
+            metrics.increment("useragents_generated", n, browser=browser or "any")
+        permutation = FeistelPermutation(catalog.cardinality(browser), self.rng.getrandbits(64))
+        return iter_permutation(catalog, permutation, 0, n, browser)
+
+    @staticmethod
+    def _resolve_browsers(catalog: Catalog, browser: Optional[str]) -> List[str]:
+        if browser is not None:
+            catalog.cardinality(browser)
+            return [browser]
+        return [name for name in BROWSERS if catalog.cardinality(name) and catalog.browser_weights[name] > 0]
+
+    def _browser_picker(self, catalog: Catalog, browsers: List[str]) -> Callable[[], str]:
+        if len(browsers) == 1:
+            browser = browsers[0]
+            return lambda: browser
+        table = AliasTable([catalog.browser_weights[name] for name in browsers])
+        rng = self.rng
+        return lambda: browsers[table.sample(rng)]
+
+    @staticmethod
+    def _check_capacity(catalog: Catalog, browser: Optional[str], count: int):
+        capacity = catalog.cardinality(browser)
+        if count > capacity:
+            raise ValueError(
+                f"Requested {count} unique user agents but the catalog can only produce {capacity}. "
+                "Run '--update all' to add more versions or request fewer."
+            )
+
+    def iter_useragents(self, browser: str = None, unique: bool = False, limit: int = None) -> Iterator[str]:
+        """
+        Lazily yields user agents from the in-memory catalog.
+        Nothing is buffered, so an unbounded iterator runs in constant memory; with
+        `unique=True` the iterator remembers what it has yielded (memory grows with the
+        number of agents produced) and stops once the catalog is exhausted, or after
+        `MAX_CONSECUTIVE_DUPLICATES` duplicate draws in a row. The iterator keeps using the
+        catalog that was current when it was created, even if the generator reloads.
+        Args:
+            browser (str, optional): "Chrome", "Firefox" or "Opera". Defaults to None, which
+                picks a random browser for every user agent.
+            unique (bool, optional): Never yield the same user agent twice. Defaults to False.
+            limit (int, optional): Stop after this many user agents. Defaults to None (unbounded).
+        Returns:
+            Iterator[str]: An iterator of user agent strings.
+        Raises:
+            ValueError: If the browser is unsupported, `limit` is negative, or `unique` is set
+                and `limit` exceeds the number of distinct user agents available.
+        Example:
+            >>> for ua in generator.iter_useragents("Firefox", limit=3):
+            ...     print(ua)
+        """
+        catalog = self.catalog
+        browsers = self._resolve_browsers(catalog, browser)
+        if limit is not None:
+            if limit < 0:
+                raise ValueError(f"limit must be non-negative, got {limit}")
+            if unique:
+                self._check_capacity(catalog, browser, limit)
+        return self._iter_useragents(catalog, browsers, unique, limit)
+
+    def _iter_useragents(self, catalog: Catalog, browsers: List[str], unique: bool,
+                         limit: Optional[int]) -> Iterator[str]:
+        create_useragent = partial(self._create_useragent, catalog)
+        pick_browser = self._browser_picker(catalog, browsers)
+        remaining = -1 if limit is None else limit
+
+        if not unique:
+            while remaining:
+                remaining -= 1
+                yield create_useragent(pick_browser())
+            return
+
+        seen = set()
+        capacity = sum(catalog.cardinality(name) for name in browsers)
+        duplicates = 0
+        while remaining and len(seen) < capacity and duplicates < MAX_CONSECUTIVE_DUPLICATES:
+            user_agent = create_useragent(pick_browser())
+            if user_agent not in seen:
+                seen.add(user_agent)
+                duplicates = 0
+                remaining -= 1
+                yield user_agent
             else:
-                system_select = system_select.strip(";").replace("Intel Mac OS X", "CPU iPhone OS") + " like Mac OS X"
-            
-            FIREFOX_VERS_SELECT = str(random.choice(self.FIREFOX_VERS)).replace("Firefox", "FxiOS")
-            return f"{Moz}/{Mozilla_vers} ({system_select}; {type_select}) Gecko/20100101 {FIREFOX_VERS_SELECT} Mobile/15E148"
-        else:
-            FIREFOX_VERS_SELECT = random.choice(self.FIREFOX_VERS)
-            return f"{Moz}/{Mozilla_vers} ({system_select}; {type_select}; rv:109.0) Gecko/20100101 {FIREFOX_VERS_SELECT}"
-    
-    def _create_opera_agent(self,select_key: str, system_select: str, type_select: str) -> str:
+                duplicates += 1
+                if metrics.enabled:
+                    metrics.increment("dedupe_collisions")
+
+    def iter_batches(self, size: int, browser: str = None, unique: bool = False,
+                     limit: int = None) -> Iterator[List[str]]:
         """
-        Generates an Opera browser User-Agent string based on the provided system and type selections.
+        Like `iter_useragents`, but yields lists of `size` user agents at a time so the
+        per-item generator overhead is paid once per chunk. The last chunk may be shorter
+        when `limit` is not a multiple of `size` or a unique run exhausts the catalog.
         Args:
-            system_select (str): The system information string (e.g., "iPhone", "iPad", or other OS descriptors).
-            type_select (str): The type information string (e.g., device type or architecture).
+            size (int): Number of user agents per chunk.
+            browser (str, optional): Browser to generate for. Defaults to a random browser per agent.
+            unique (bool, optional): Never yield the same user agent twice. Defaults to False.
+            limit (int, optional): Total number of user agents across all chunks. Defaults to None.
         Returns:
-            str: A formatted Opera User-Agent string appropriate for the specified system and type.
-        Notes:
-            - If the system is an iPhone or iPad, the User-Agent string is tailored for iOS devices.
-            - Otherwise, a standard Opera User-Agent string is generated.
-            - Random Opera and Chrome version numbers are selected from predefined lists.
-        """
-        Moz = "Mozilla"
-        Mozilla_vers = "5.0"
-        
-        if "iPhone" in system_select or "iPad" in system_select:
-            if "iPad" in system_select:
-                system_select = system_select.strip(";").replace("Intel Mac OS X", "CPU OS") + " like Mac OS X"
+            Iterator[List[str]]: An iterator of user agent lists.
+        Raises:
+            ValueError: Same conditions as `iter_useragents`, or if `size` is not positive.
+        """
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+        catalog = self.catalog
+        browsers = self._resolve_browsers(catalog, browser)
+        if limit is not None:
+            if limit < 0:
+                raise ValueError(f"limit must be non-negative, got {limit}")
+            if unique:
+                self._check_capacity(catalog, browser, limit)
+        if unique:
+            return self._chunk(self._iter_useragents(catalog, browsers, True, limit), size)
+        return self._iter_batches(catalog, browsers, size, limit)
+
+    def _iter_batches(self, catalog: Catalog, browsers: List[str], size: int,
+                      limit: Optional[int]) -> Iterator[List[str]]:
+        create_useragent = partial(self._create_useragent, catalog)
+        pick_browser = self._browser_picker(catalog, browsers)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            n = size if remaining is None else min(size, remaining)
+            if len(browsers) == 1:
+                browser = browsers[0]
+                yield [create_useragent(browser) for _ in range(n)]
             else:
-                system_select = system_select.strip(";").replace("Intel Mac OS X", "CPU iPhone OS") + " like Mac OS X"
-            
-            OPERA_VERS_SELECT = random.choice(self.OPERA_VERS)
-            CHROME_VERS_SELECT = random.choice(self.CHROME_VERS)
-            return f"{Moz}/{Mozilla_vers} ({system_select}; {type_select}) AppleWebKit/537.36 (KHTML, like Gecko) {CHROME_VERS_SELECT} Mobile Safari/537.36 OPR/{OPERA_VERS_SELECT.split('/')[0]}"
-        else:
-            OPERA_VERS_SELECT = random.choice(self.OPERA_VERS)
-            CHROME_VERS_SELECT = random.choice(self.CHROME_VERS)
-            return f"{Moz}/{Mozilla_vers} ({system_select}; {type_select}) AppleWebKit/537.36 (KHTML, like Gecko) {CHROME_VERS_SELECT} Safari/537.36 OPR/{OPERA_VERS_SELECT.split('/')[0]}"
+                yield [create_useragent(pick_browser()) for _ in range(n)]
+            if remaining is not None:
+                remaining -= n
+
+    @staticmethod
+    def _chunk(iterator: Iterator[str], size: int) -> Iterator[List[str]]:
+        chunk = list(islice(iterator, size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(iterator, size))
     
-    def get_list(self, count: int) -> List[str]:
+    @staticmethod
+    def _split_count(catalog: Catalog, browsers: List[str], count: int) -> List[int]:
+        # Shares proportional to the browser weights (largest remainder), capped at each
+        # browser's cardinality with the overflow handed to the browsers that still have room.
+        caps = [catalog.cardinality(name) for name in browsers]
+        weights = [catalog.browser_weights[name] if len(browsers) > 1 else 1.0 for name in browsers]
+        quotas = [0] * len(browsers)
+        active = list(range(len(browsers)))
+        remaining = count
+        while remaining and active:
+            total = sum(weights[i] for i in active)
+            shares = {i: remaining * weights[i] / total for i in active}
+            full = [i for i in active if shares[i] >= caps[i] - quotas[i]]
+            if full:
+                for i in full:
+                    remaining -= caps[i] - quotas[i]
+                    quotas[i] = caps[i]
+                active = [i for i in active if i not in full]
+                continue
+            for i in active:
+                quotas[i] += int(shares[i])
+            leftover = remaining - sum(int(shares[i]) for i in active)
+            for i in sorted(active, key=lambda i: shares[i] - int(shares[i]), reverse=True)[:leftover]:
+                quotas[i] += 1
+            remaining = 0
+        return quotas
+
+    def get_list(self, count: int, browser: str = None) -> List[str]:
         """
-        Generate a list of unique user agent strings.
+        Generate a list of exactly `count` unique user agent strings.
+        `count` is first split across the browsers in proportion to their sampling weights
+        (a browser never gets more than it can produce; the excess goes to the others), so
+        the browser mix is the same for small and large lists. Each browser's share is
+        drawn with rejection sampling against a hash set, or, when the share is more than
+        half of that browser's cardinality and rejection would mostly draw duplicates, from
+        `sample_unique`. The combined list is shuffled.
         Args:
             count (int): The number of user agent strings to generate.
+            browser (str, optional): Only generate this browser's agents. Defaults to all browsers.
         Returns:
-            List[str]: A list of unique user agent strings for randomly selected browsers
-                       (Chrome, Firefox, or Opera).
-        Note:
-            The method attempts to generate `count` user agents, but the returned list
-            may contain fewer items if duplicate user agents are generated, as only
-            unique agents are included in the result.
-        """
-
-        user_agent_list = []
-        browsers = ["Chrome", "Firefox", "Opera"]
-        
-        for i in range(count):
-            try :
-                browser_select = random.choice(browsers)
-                user_agent = self.create_useragent(browser_select)
-                
-                if user_agent not in user_agent_list:
-                    user_agent_list.append(user_agent)
-            except Exception as e:
-                print(f"Error generating user agent: {e}")
-        
-        return user_agent_list
\ No newline at end of file
+            List[str]: A list of `count` unique user agent strings.
+        Raises:
+            ValueError: If the browser is unsupported, `count` is negative, or `count` is
+                larger than the number of distinct user agents the catalog can produce
+                (see `cardinality()`).
+        """
+        catalog = self.catalog
+        browsers = self._resolve_browsers(catalog, browser)
+        if count < 0:
+            raise ValueError(f"count must be non-negative, got {count}")
+        self._check_capacity(catalog, browser, count)
+
+        user_agents = []
+        for name, quota in zip(browsers, self._split_count(catalog, browsers, count)):
+            if quota * 2 > catalog.cardinality(name):
+                user_agents.extend(self._sample_unique(catalog, quota, name))
+            elif quota:
+                drawn = list(self._iter_useragents(catalog, [name], True, quota))
+                if len(drawn) < quota:
+                    # Rejection gave up on a skewed share; walk the permutation instead.
+                    drawn = list(self._sample_unique(catalog, quota, name))
+                user_agents.extend(drawn)
+        self.rng.shuffle(user_agents)
+        return user_agents
@@ -1,152 +1,375 @@
-from bs4 import BeautifulSoup
-import datetime,random, requests
-from typing import Dict, List, Any
+import io
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
-class VersionFetcher:
+import requests
+import lxml.html
+from lxml import etree
+
+from .http import HostLimiter, HttpClient
+from .http_cache import HttpCache, body_digest
+from .metrics import metrics
+from .replay import FixtureStore, RecordingAdapter, ReplayAdapter
+
+OPERA_CHANGELOG_URL = "https://blogs.opera.com/desktop/changelog-for-{}/"
+OPERA_FIRST_MAJOR = 60
+
+ANDROID_SKIPPED_VERSIONS = ['1.0', '1.1', '1.5', '1.6', '2.0', '2.1', '2.2', '2.2.3', 
+                            '2.3', '2.3.7', '3.0', '3.2.6', '4.0', '4.0.4', '4.1', '4.3.1']
+
+MACOS_RELEASE_PAGES = ["https://en.wikipedia.org/wiki/OS_X_Mountain_Lion","https://en.wikipedia.org/wiki/OS_X_Mavericks","https://en.wikipedia.org/wiki/OS_X_Yosemite",
+    "https://en.wikipedia.org/wiki/OS_X_El_Capitan","https://en.wikipedia.org/wiki/MacOS_Sierra","https://en.wikipedia.org/wiki/MacOS_High_Sierra",
+    "https://en.wikipedia.org/wiki/MacOS_Mojave","https://en.wikipedia.org/wiki/MacOS_Catalina"]
+MACOS_UPDATE_PAGES = ["https://en.wikipedia.org/wiki/MacOS_Big_Sur","https://en.wikipedia.org/wiki/MacOS_Monterey","https://en.wikipedia.org/wiki/MacOS_Ventura"]
+
+# Bump whenever a parse_* function changes its output, to invalidate cached parse results.
+PARSER_VERSION = 2
+
+# All upstream pages are UTF-8; decoding up front keeps "–" intact whatever the markup says.
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+BROWSER_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.5304 Safari/537.36'}
+
+
+def _html(content: bytes):
+    return lxml.html.document_fromstring(content, parser=_HTML_PARSER)
+
+
+def _has_class(class_name: str) -> str:
+    # XPath predicate matching one token of a multi-valued class attribute.
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _table_rows(table) -> list:
+    rows = table.xpath("(.//tbody)[1]//tr")
+    return rows if rows else table.xpath(".//tr")
+
+
+def parse_chrome_listing(content: bytes) -> Dict[str, Any]:
+    """
+    Parses the chromedriver bucket listing into Chrome versions (major 80+) and their
+    upload timestamps. `Contents` entries are processed as they are parsed and then freed,
+    so the large listing never becomes a full tree.
+    """
+    version_list = []
+    version_dicts = {}
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+    for _, contents in etree.iterparse(io.BytesIO(content), events=("end",), tag="{*}Contents"):
+        fields = {child.tag.rpartition("}")[2]: child.text or "" for child in contents}
+        contents.clear()
+        version = fields.get("Key", "").split("/")[0]
+        date = fields.get("LastModified", "").strip()
+        
+        if (version and "RELEASE" not in version and "icons" not in version 
+            and "index" not in version and version[0].isdigit()):
+            try:
+                if int(version.split(".")[0]) > 79:
+                    version_list.append(f"Chrome/{version.strip()}")
+                    version_dicts[version] = date
+            except (ValueError, IndexError):
+                continue
     
-    def fetch_chrome_versions(self) -> Dict[str, Any]:
-        url = "https://chromedriver.storage.googleapis.com"
-        req = self.session.get(url)
-        soup = BeautifulSoup(req.content, "xml")
+    return {"Version_list": version_list, "Version_dict": version_dicts}
+
+
+def parse_firefox_releases(content: bytes) -> List[str]:
+    """
+    Parses the Mozilla release list into "Firefox/<version>" strings (major 71+),
+    including point releases.
+    """
+    versions = []
+    
+    release = _html(content).xpath(f"(//ol[{_has_class('c-release-list')}])[1]")
+    if release:
+        for li in release[0].iter("li"):
+            link = li.xpath("(.//a)[1]")
+            if not link:
+                continue
+            strong = link[0].text_content()
+            try:
+                if float(strong) > 70.0:
+                    versions.append(f"Firefox/{strong}")
+                    
+                    for ol_li in li.iterdescendants("li"):
+                        versions.append(f"Firefox/{ol_li.text_content()}")
+            except ValueError:
+                continue
+    
+    return versions
+
+
+def parse_opera_changelog(content: bytes) -> Optional[List[Tuple[str, str]]]:
+    """
+    Parses one Opera changelog page into (version, date) pairs. Returns None if the page
+    has no changelog content.
+    """
+    content = _html(content).xpath(f"(//div[{_has_class('content')}])[1]")
+    if not content:
+        return None
+    
+    releases = []
+    for strong in content[0].iter("h4") :
+        splt = strong.text_content().split("– 20")
+        if len(splt) > 1 :
+            releases.append((splt[0].strip(), splt[1].strip().split(" ")[0]))
+    return releases
+
+
+def parse_android_versions(content: bytes) -> List[str]:
+    """
+    Parses the Android version table into "Linux;Android <version>" strings.
+    """
+    versions = []
+    
+    table = _html(content).xpath(f"(//table[{_has_class('wikitable')}])[1]")
+    if table:
+        for tr in _table_rows(table[0]):
+            tds = tr.xpath(".//td")
+            if tds:
+                for version in tds[0].text_content().strip().split("-"):
+                    version_clean = version.strip()
+                    if version_clean and version_clean not in ANDROID_SKIPPED_VERSIONS:
+                        versions.append(f"Linux;Android {version_clean}")
+    
+    return versions
+
+
+def parse_macos_release_page(content: bytes) -> List[str]:
+    """
+    Parses an OS X/macOS (10.8-10.15) Wikipedia page: versions are in the first cell of
+    the first wikitable.
+    """
+    versions = []
+    table = _html(content).xpath(f"(//table[{_has_class('wikitable')}])[1]")[0]
+    for tr in _table_rows(table) :
+        tds = tr.xpath(".//td")
+        if tds and "." in tds[0].text_content() :
+            versions.append(tds[0].text_content().strip())
+    return versions
+
+
+def parse_macos_update_page(content: bytes) -> List[str]:
+    """
+    Parses a macOS 11+ Wikipedia page: versions are in the header cells of the second
+    wikitable, with footnote markers stripped.
+    """
+    versions = []
+    table = _html(content).xpath(f"(//table[{_has_class('wikitable')}])[2]")[0]
+    for tr in _table_rows(table) :
+        th = tr.xpath("(.//th)[1]")
+        if th and "." in th[0].text_content().strip() :
+            versions.append(th[0].text_content().strip().split("[")[0])
+    return versions
+
+
+class ParseTiming(NamedTuple):
+    url: str
+    parser: str
+    size: int
+    seconds: float
+    cached: bool
+
+
+class VersionFetcher:
+    """
+    VersionFetcher
+    Downloads and parses browser and OS version lists from their upstream pages.
+    All requests go through one shared `HttpClient` (pooled session, timeouts, retries,
+    per-host politeness limits and per-source circuit breaking), so the fetch methods can
+    safely run concurrently from several threads.
+    Pages are requested conditionally against an on-disk `HttpCache`, and parse results
+    are cached by body hash, so unchanged pages cost neither bandwidth nor parsing.
+    Parsing itself lives in the pure `parse_*` functions; every parsed (or cache-served)
+    page is recorded in `parse_timings` as a `ParseTiming`.
+    Args:
+        client (HttpClient, optional): HTTP transport. Defaults to `HttpClient()`.
+        cache (HttpCache, optional): Page and parse cache. Defaults to `HttpCache()` in the
+            user cache directory.
+        use_cache (bool, optional): Set to False to always download and parse. Defaults to True.
+        record_to (str, optional): Also save every response as a fixture in this directory.
+        replay_from (str, optional): Serve every request from the fixtures in this directory
+            instead of the network. Unless a `cache` is passed, the user cache is not used.
+    Example:
+        >>> fetcher = VersionFetcher(replay_from="fixtures/upstream")
+        >>> fetcher.fetch_firefox_versions()["Version_list"][:1]
+    """
+    
+    def __init__(self, client: HttpClient = None, cache: HttpCache = None, use_cache: bool = True,
+                 record_to: str = None, replay_from: str = None):
+        if record_to and replay_from:
+            raise ValueError("record_to and replay_from are mutually exclusive")
         
-        key_list = soup.find_all("Key")
-        date_list = soup.find_all("LastModified")
+        if client is None and replay_from:
+            # Nothing to be polite to or to retry against when serving local files.
+            client = HttpClient(retries=0, limiter=HostLimiter(min_interval=0.0))
+        self.client = client or HttpClient()
+        if replay_from and cache is None:
+            use_cache = False
+        self.cache = (cache or HttpCache()) if use_cache else None
         
-        version_list = []
-        version_dicts = {}
+        if record_to:
+            adapter = RecordingAdapter(FixtureStore(record_to))
+        elif replay_from:
+            adapter = ReplayAdapter(FixtureStore(replay_from))
+        else:
+            adapter = None
+        if adapter is not None:
+            self.client.session.mount("https://", adapter)
+            self.client.session.mount("http://", adapter)
+        self.parse_timings = []
+        self._timings_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        return self.client.session
+    
+    def _get(self, url: str, headers: Dict[str, str] = None) -> requests.Response:
+        if not metrics.enabled:
+            return self.client.get(url, headers=headers)
+        host = urlsplit(url).hostname
+        with metrics.timer("http_request_seconds", host=host):
+            response = self.client.get(url, headers=headers)
+        metrics.increment("http_responses", host=host, status=response.status_code)
+        return response
+    
+    def _fetch(self, url: str, headers: Dict[str, str] = None) -> Optional[Tuple[bytes, str]]:
+        """
+        GETs `url`, conditionally if a cached copy exists.
+        Returns:
+            Optional[Tuple[bytes, str]]: The body and its SHA-256 digest (served from the
+            cache on a 304), or None if the page does not exist (404).
+        """
+        headers = dict(headers or {})
+        if self.cache is not None:
+            headers.update(self.cache.conditional_headers(url))
+        
+        req = self._get(url, headers=headers)
+        if req.status_code == 304 and self.cache is not None:
+            body = self.cache.body(url)
+            if body is not None:
+                return body, body_digest(body)
+            # The cached body went missing; fall back to a plain request.
+            req = self._get(url, headers={key: value for key, value in headers.items()
+                                          if not key.startswith("If-")})
+        if req.status_code == 404:
+            return None
+        req.raise_for_status()
         
-        for ky in range(len(key_list)):
-            version = str(key_list[ky].text).split("/")[0]
-            date = str(date_list[ky].text).strip()
-            
-            if (version and "RELEASE" not in version and "icons" not in version 
-                and "index" not in version and version[0].isdigit()):
-                try:
-                    if int(version.split(".")[0]) > 79:
-                        version_list.append(f"Chrome/{version.strip()}")
-                        version_dicts[version] = date
-                except (ValueError, IndexError):
-                    continue
+        body = req.content
+        if self.cache is None:
+            return body, body_digest(body)
+        return body, self.cache.store(url, req.headers, body)
+    
+    def _parse(self, parser: Callable[[bytes], Any], body: bytes, digest: str, url: str = None) -> Any:
+        """
+        Runs `parser` on `body`, reusing the cached result for the same body and parser,
+        and records the page in `parse_timings`.
+        """
+        start = time.perf_counter()
+        result = None
+        key = f"{parser.__name__}-v{PARSER_VERSION}"
+        if self.cache is not None:
+            result = self.cache.load_parsed(key, digest)
+        cached = result is not None
+        if not cached:
+            result = parser(body)
+            if self.cache is not None:
+                self.cache.store_parsed(key, digest, result)
         
-        return {"Version_list": version_list, "Version_dict": version_dicts}
+        seconds = time.perf_counter() - start
+        with self._timings_lock:
+            self.parse_timings.append(ParseTiming(url, parser.__name__, len(body), seconds, cached))
+        metrics.observe("parse_seconds", seconds, parser=parser.__name__, cached=cached)
+        return result
+    
+    def _fetch_parsed(self, url: str, parser: Callable[[bytes], Any], headers: Dict[str, str] = None) -> Any:
+        fetched = self._fetch(url, headers)
+        if fetched is None:
+            raise requests.HTTPError(f"404 Not Found: {url}")
+        return self._parse(parser, *fetched, url=url)
+    
+    def fetch_chrome_versions(self) -> Dict[str, Any]:
+        url = "https://chromedriver.storage.googleapis.com"
+        return self._fetch_parsed(url, parse_chrome_listing)
     
     def fetch_firefox_versions(self) -> Dict[str, Any]:
         url = "https://www.mozilla.org/en-US/firefox/releases/"
-        req = self.session.get(url)
-        soup = BeautifulSoup(req.content, "html.parser")
-        
+        version_list = self._fetch_parsed(url, parse_firefox_releases)
+        # The release list carries no dates; None means "unknown", never "now".
+        return {"Version_list": version_list, "Version_dict": dict.fromkeys(version_list)}
+    
+    def _fetch_opera_major(self, major: int) -> Optional[List[Tuple[str, str]]]:
+        """
+        Fetches and parses the changelog page of one Opera major version.
+        Returns None when the page does not exist (404 or no changelog content), which
+        marks the end of the published majors.
+        """
+        fetched = self._fetch(OPERA_CHANGELOG_URL.format(major), headers=BROWSER_HEADERS)
+        if fetched is None:
+            return None
+        return self._parse(parse_opera_changelog, *fetched, url=OPERA_CHANGELOG_URL.format(major))
+    
+    def fetch_opera_versions(self, since_major: int = None, window: int = 4) -> Dict[str, Any]:
+        """
+        Fetches Opera versions from the per-major changelog pages.
+        Only majors from `since_major` upwards are fetched: that page is re-read because it
+        may have gained point releases, and newer pages are probed in parallel, up to
+        `window` at a time, until the first missing page. A routine refresh therefore reads
+        the newest known page plus the probe for the next one.
+        Args:
+            since_major (int, optional): Highest major already stored. Defaults to fetching
+                everything from major 60.
+            window (int, optional): Pages requested concurrently while probing. Defaults to 4.
+        Returns:
+            Dict[str, Any]: "Version_list" ("OPR/<version>") and "Version_dict" (version to date).
+        """
+        major = OPERA_FIRST_MAJOR if since_major is None else max(since_major, OPERA_FIRST_MAJOR)
+        window = max(1, window)
         version_list = []
         version_dicts = {}
         
-        release = soup.find("ol", {"class": "c-release-list"})
-        if release:
-            li_list = release.find_all("li")
-            
-            for li in li_list:
-                try:
-                    strong = li.find("a").text
-                    if float(strong) > 70.0:
-                        version_list.append(f"Firefox/{strong}")
-                        version_dicts[f"Firefox/{strong}"] = datetime.datetime.now()
-                        
-                        for ol_li in li.find_all("li"):
-                            version_list.append(f"Firefox/{ol_li.text}")
-                            version_dicts[f"Firefox/{ol_li.text}"] = datetime.datetime.now()
-                except (ValueError, AttributeError):
-                    continue
+        # Incremental refreshes usually find nothing new: start with just the known page
+        # and one probe, and widen to `window` only once newer pages turn up.
+        size = min(2, window) if since_major is not None else window
         
-        return {"Version_list": version_list, "Version_dict": version_dicts}
-    
-    def fetch_opera_versions(self) -> Dict[str, Any]:
-        url = "https://blogs.opera.com/desktop/changelog-for-"
-        session = requests.Session()
-        session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.5304 Safari/537.36'})
-        version_list = []
-        version_dicts = {}
-        for ver_count in [x for x in range(60,99)]:
-            req = session.get(url+str(ver_count)+"/")
-            soup = BeautifulSoup(req.content,"html.parser") 
-            content = soup.find("div",{"class":"content"})
-            for strong in content.find_all("h4") :
-                splt = str(strong.text).split("– 20")
-                if len(splt) > 1 :
-                    version_list.append("OPR/%s"%splt[0].strip())
-                    version_dicts.update({splt[0].strip():splt[1].strip().split(" ")[0]})
+        with ThreadPoolExecutor(max_workers=window) as pool:
+            while True:
+                pages = list(pool.map(self._fetch_opera_major, range(major, major + size)))
+                for releases in pages:
+                    if releases is None:
+                        break
+                    for version, date in releases:
+                        version_list.append("OPR/%s"%version)
+                        version_dicts.update({version:date})
+                if None in pages:
+                    break
+                major += size
+                size = window
 
         return {"Version_list":version_list,"Version_dict":version_dicts}
     
     def fetch_android_versions(self) -> Dict[str, Any]:
         url = "https://tr.wikipedia.org/wiki/Android"
-        req = self.session.get(url)
-        soup = BeautifulSoup(req.content, "html.parser")
-        
-        version_list = []
-        version_dicts = {}
-        skipped_version = ['1.0', '1.1', '1.5', '1.6', '2.0', '2.1', '2.2', '2.2.3', 
-                          '2.3', '2.3.7', '3.0', '3.2.6', '4.0', '4.0.4', '4.1', '4.3.1']
-        
-        table = soup.find("table", {"class": "wikitable"})
-        if table:
-            tr_list = table.find("tbody").find_all("tr")
-            
-            for tr in tr_list:
-                try:
-                    tds = tr.find_all("td")
-                    if tds:
-                        versions = str(tds[0].text).strip().split("-")
-                        for version in versions:
-                            version_clean = version.strip()
-                            if version_clean and version_clean not in skipped_version:
-                                android_str = f"Linux;Android {version_clean}"
-                                version_list.append(android_str)
-                                version_dicts[android_str] = datetime.datetime.now()
-                except (IndexError, AttributeError):
-                    continue
-        
-        return {"Version_list": version_list, "Version_dict": version_dicts}
+        version_list = self._fetch_parsed(url, parse_android_versions)
+        return {"Version_list": version_list, "Version_dict": dict.fromkeys(version_list)}
     
     def fetch_macos_versions(self) -> Dict[str, Any]:
-        urls = ["https://en.wikipedia.org/wiki/OS_X_Mountain_Lion","https://en.wikipedia.org/wiki/OS_X_Mavericks","https://en.wikipedia.org/wiki/OS_X_Yosemite",
-            "https://en.wikipedia.org/wiki/OS_X_El_Capitan","https://en.wikipedia.org/wiki/MacOS_Sierra","https://en.wikipedia.org/wiki/MacOS_High_Sierra",
-            "https://en.wikipedia.org/wiki/MacOS_Mojave","https://en.wikipedia.org/wiki/MacOS_Catalina"]
-        urls2 = ["https://en.wikipedia.org/wiki/MacOS_Big_Sur","https://en.wikipedia.org/wiki/MacOS_Monterey","https://en.wikipedia.org/wiki/MacOS_Ventura"]
-        session = requests.Session()
-        session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.5304 Safari/537.36'})
         version_list = []
         version_dicts = {}
         devices = ["iPhone","iPad","Macintosh"]
-        for url in urls :
-            req = session.get(url)
-            soup = BeautifulSoup(req.content,"html.parser")  
-            tr_list = soup.find_all("table",{"class":"wikitable"})[0].find("tbody").find_all("tr")
-            for tr in tr_list :
-                try :
-                    if "." in tr.find_all("td")[0].text :
-                        rdm_chc = random.choice(devices)
-                        version_list.append("%s; Intel Mac OS X %s"%(rdm_chc,str(tr.find_all("td")[0].text).strip()))
-                        version_dicts.update({"%s; Intel Mac OS X %s"%(rdm_chc,str(tr.find_all("td")[0].text).strip()):datetime.datetime.now()})
-
-                except:
-                    pass
-        for url in urls2 :
-            req = session.get(url)
-            soup = BeautifulSoup(req.content,"html.parser")  
-            tr_list = soup.find_all("table",{"class":"wikitable"})[1].find("tbody").find_all("tr")
-            for tr in tr_list :
-                try :
-                    if "." in str(tr.find("th").text).strip() :
-                        rdm_chc = random.choice(devices)
-                        version_list.append("%s; Intel Mac OS X %s"%(rdm_chc,str(tr.find("th").text).strip().split("[")[0]))
-                        version_dicts.update({"%s; Intel Mac OS X %s"%(rdm_chc,str(tr.find("th").text).strip().split("[")[0]):datetime.datetime.now()})
-                except:
-                    pass     
+        pages = ([(url, parse_macos_release_page) for url in MACOS_RELEASE_PAGES]
+                 + [(url, parse_macos_update_page) for url in MACOS_UPDATE_PAGES])
+        for url, parser in pages :
+            for version in self._fetch_parsed(url, parser, headers=BROWSER_HEADERS) :
+                # The device is derived from the version, so refetching yields the same rows.
+                system = "%s; Intel Mac OS X %s"%(devices[zlib.crc32(version.encode()) % len(devices)],version)
+                version_list.append(system)
+                version_dicts.update({system:None})
         pop_index = version_list[-1]
         version_list.pop(-1)
         version_dicts.pop(pop_index)
-        return {"Version_list":version_list,"Version_dict":version_dicts}      
+        return {"Version_list":version_list,"Version_dict":version_dicts}
@@ -1,14 +1,20 @@
 import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from functools import partial
 
 from .database import Database
-from .version_fetcher import VersionFetcher
+from .metrics import metrics
+from .versions import parse_release_date
 import random
 
 class VersionUpdater:
-    def __init__(self, db_path: str = None):
-        self.db = Database(db_path)
-        self.fetcher = VersionFetcher()
+    def __init__(self, db_path: str = None, wal: bool = True):
+        # WAL keeps readers of a user database unblocked while this updater writes;
+        # `Database` never applies it to the packaged database.
+        self.db = Database(db_path, wal=wal)
+        self._fetcher = None
         
         self.windows_versions = [
             "Windows NT 6.0",  # Vista
@@ -37,6 +43,22 @@ class VersionUpdater:
             "Android": self._generate_android_systems()
         }
     
+    @property
+    def fetcher(self):
+        """
+        The VersionFetcher used for web updates. It is created on first use so that
+        operations which never touch the network (such as `initialize_database`) do
+        not import the HTTP/HTML stack or open a session.
+        """
+        if self._fetcher is None:
+            from .version_fetcher import VersionFetcher
+            self._fetcher = VersionFetcher()
+        return self._fetcher
+
+    @fetcher.setter
+    def fetcher(self, fetcher):
+        self._fetcher = fetcher
+
     def _generate_mac_systems(self) -> List[str]:
         """
         Generates a list of macOS system strings for various Apple devices and OS versions.
@@ -65,120 +87,117 @@ class VersionUpdater:
         ]
         return devices
     
-    def update_chrome(self) -> Tuple[int, int]:
+    def _apply_versions(self, table: str, current_data: List[Tuple], fetched) -> Tuple[int, int]:
+        """
+        Diffs fetched versions against the stored rows and writes only the differences.
+        A version is added if it is not stored yet, and updated only if the fetched release
+        date is known and differs from the stored one as a date (so re-formatted timestamps
+        do not count as changes). Lookups go through a dict, so the diff is linear, and no
+        write happens at all when nothing changed.
+        Args:
+            table (str): The version table, e.g. "chrome_versions".
+            current_data (List[Tuple]): Stored (version, release_date, last_updated) rows.
+            fetched: Iterable of (version, release_date) pairs; the date may be None if unknown.
+        Returns:
+            Tuple[int, int]: The number of versions added and updated.
+        """
+        current = {version: parse_release_date(release_date) for version, release_date, _ in current_data}
+        
+        dt_add = []
+        dt_update = []
+        now = datetime.datetime.now().isoformat()
+        for version, date in fetched:
+            date = date.isoformat() if hasattr(date, 'isoformat') else date
+            parsed = parse_release_date(date)
+            if version not in current:
+                dt_add.append((version, date, now))
+            elif parsed is not None and parsed != current[version]:
+                dt_update.append((version, date, now))
+            else:
+                continue
+            current[version] = parsed
+        
+        if dt_add or dt_update:
+            self.db.upsert_versions(table, dt_add, dt_update)
+        
+        return len(dt_add), len(dt_update)
+    
+    def update_chrome(self, web_data: Dict[str, Any] = None) -> Tuple[int, int]:
         """
         Updates the Chrome version information in the database by comparing fetched web data with current records.
         Fetches the latest Chrome version data using the fetcher, compares it with the versions stored in the database,
         and determines which versions need to be added or updated. If there are new or updated versions, it updates the
         database accordingly.
+        Args:
+            web_data (Dict[str, Any], optional): Already fetched data; fetched now if omitted.
         Returns:
             Tuple[int, int]: A tuple containing the number of versions added and the number of versions updated.
         Exceptions:
             Catches all exceptions, prints an error message, and returns (0, 0) in case of failure.
         """
         try:
-            web_data = self.fetcher.fetch_chrome_versions()
-            current_versions, current_data = self.db.get_chrome_vers()
-            
-            dt_add = []
-            dt_update = []
-            now = datetime.datetime.now().isoformat()
-            
-            for version, date in web_data["Version_dict"].items():
-                chrome_version = f"Chrome/{version.strip()}"
-                
-                if chrome_version in current_versions:
-                    idx = current_versions.index(chrome_version)
-                    original_date = current_data[idx][1]
-                    
-                    if date != original_date:
-                        dt_update.append((chrome_version, date, now))
-                else:
-                    dt_add.append((chrome_version, date, now))
-            
-            if dt_add or dt_update:
-                self.db.add_chrome_versions(dt_add, dt_update)
-            
-            return len(dt_add), len(dt_update)
+            if web_data is None:
+                self._set_deadline(None)
+                web_data = self.fetcher.fetch_chrome_versions()
+            fetched = ((f"Chrome/{version.strip()}", date) for version, date in web_data["Version_dict"].items())
+            return self._apply_versions("chrome_versions", self.db.get_chrome_vers()[1], fetched)
             
         except Exception as e:
             print(f"Chrome update error: {e}")
             return 0, 0
     
-    def update_firefox(self) -> Tuple[int, int]:
+    def update_firefox(self, web_data: Dict[str, Any] = None) -> Tuple[int, int]:
         """
         Updates the Firefox version information in the database by comparing fetched web data with current records.
         Fetches the latest Firefox version data from the web, compares it with the versions stored in the database,
         and determines which versions need to be added or updated based on their release dates. If there are new or
         updated versions, it updates the database accordingly.
+        Args:
+            web_data (Dict[str, Any], optional): Already fetched data; fetched now if omitted.
         Returns:
             Tuple[int, int]: A tuple containing the number of versions added and the number of versions updated.
         Exceptions:
             Catches all exceptions, prints an error message, and returns (0, 0) in case of failure.
         """
         try:
-            web_data = self.fetcher.fetch_firefox_versions()
-            current_versions, current_data = self.db.get_firefox_vers()
-            
-            dt_add = []
-            dt_update = []
-            now = datetime.datetime.now().isoformat()
-            for version, date in web_data["Version_dict"].items():
-                if version in current_versions:
-                    pass
-                else:
-                    dt_add.append((version, date.isoformat() if hasattr(date, 'isoformat') else str(date), now))
-            
-            if dt_add or dt_update:
-                self.db.add_firefox_versions(dt_add, dt_update)
-            
-            return len(dt_add), len(dt_update)
+            if web_data is None:
+                self._set_deadline(None)
+                web_data = self.fetcher.fetch_firefox_versions()
+            return self._apply_versions("firefox_versions", self.db.get_firefox_vers()[1], web_data["Version_dict"].items())
             
         except Exception as e:
             print(f"Firefox update error: {e}")
             return 0, 0
 
-    def update_opera(self) -> Tuple[int, int]:
+    def update_opera(self, web_data: Dict[str, Any] = None) -> Tuple[int, int]:
         """
         Updates the Opera browser version information in the database by comparing fetched web data with current records.
         Fetches the latest Opera versions and their release dates from an external source, compares them with the versions stored in the database, and determines which versions need to be added or updated. New or updated versions are then written to the database.
+        Args:
+            web_data (Dict[str, Any], optional): Already fetched data; fetched now if omitted.
         Returns:
             Tuple[int, int]: A tuple containing the number of new versions added and the number of existing versions updated.
         Exceptions:
             Catches and logs any exceptions that occur during the update process, returning (0, 0) in case of error.
         """
         try :
-            web_data = self.fetcher.fetch_opera_versions()
-            current_versions, current_data = self.db.get_opera_vers()
-            
-            dt_add = []
-            dt_update = []
-            now = datetime.datetime.now().isoformat()
-            for version, date in web_data["Version_dict"].items():
-                if version in current_versions:
-                    idx = current_versions.index(version)
-                    original_date = current_data[idx][1]
-                    
-                    if isinstance(original_date, str) and date != original_date:
-                        dt_update.append((version, date.isoformat() if hasattr(date, 'isoformat') else str(date), now))
-                else:
-                    dt_add.append((version, date.isoformat() if hasattr(date, 'isoformat') else str(date), now))
-                    
-            if dt_add or dt_update:
-                self.db.add_opera_versions(dt_add, dt_update)
-            
-            return len(dt_add), len(dt_update)
+            if web_data is None:
+                self._set_deadline(None)
+                web_data = self.fetcher.fetch_opera_versions(since_major=self.db.get_max_major("opera"))
+            return self._apply_versions("opera_versions", self.db.get_opera_vers()[1], web_data["Version_dict"].items())
             
         except Exception as e:
             print(f"Opera update error: {e}")
             return 0, 0
             
-    def update_android(self) -> Tuple[int, int]:
+    def update_android(self, web_data: Dict[str, Any] = None) -> Tuple[int, int]:
         """
         Update Android versions in the database with the latest data from the web.
         Fetches the latest Android versions from the web, compares them with the 
         current versions stored in the database, and updates or adds new versions 
         as needed.
+        Args:
+            web_data (Dict[str, Any], optional): Already fetched data; fetched now if omitted.
         Returns:
             Tuple[int, int]: A tuple containing:
                 - Number of new Android versions added (int)
@@ -188,22 +207,10 @@ class VersionUpdater:
             and prints an error message to the console.
         """
         try:
-            web_data = self.fetcher.fetch_android_versions()
-            current_versions, current_data = self.db.get_android_vers()
-            
-            dt_add = []
-            dt_update = []
-            now = datetime.datetime.now().isoformat()
-            for version, date in web_data["Version_dict"].items():
-                if version in current_versions:
-                    pass
-                else:
-                    dt_add.append((version, date.isoformat() if hasattr(date, 'isoformat') else str(date), now))
-            
-            if dt_add or dt_update:
-                self.db.add_android_versions(dt_add, dt_update)
-            
-            return len(dt_add), len(dt_update)
+            if web_data is None:
+                self._set_deadline(None)
+                web_data = self.fetcher.fetch_android_versions()
+            return self._apply_versions("android_versions", self.db.get_android_vers()[1], web_data["Version_dict"].items())
             
         except Exception as e:
             print(f"Android update error: {e}")
@@ -269,10 +276,10 @@ class VersionUpdater:
         try:
             dt_add = []
             now = datetime.datetime.now().isoformat()
-            getting_current_versions = self.db.get_windows_vers()
+            current_versions = set(self.db.get_windows_vers()[0])
             
             for version in self.windows_versions:
-                if version not in getting_current_versions[0]:
+                if version not in current_versions:
                     dt_add.append((version, now, now))
             
             if dt_add:
@@ -291,58 +298,53 @@ class VersionUpdater:
             print(f"Linux update error: {e}")
             return 0, 0
     
-    def update_mac(self) -> Tuple[int, int]:
+    def update_mac(self, web_data: Dict[str, Any] = None) -> Tuple[int, int]:
         """
         Updates the local database with new macOS versions fetched from an external source.
         Fetches the latest macOS version information using the fetcher, compares it with the
         versions currently stored in the database, and adds any new versions that are not already present.
+        Versions are compared without their device prefix, so a stored row keeps its device.
         The method records the current timestamp for each new entry. If there are new or updated versions,
         they are added to the database.
+        Args:
+            web_data (Dict[str, Any], optional): Already fetched data; fetched now if omitted.
         Returns:
             Tuple[int, int]: A tuple containing the number of new versions added and the number of versions updated.
         Exceptions:
             Catches all exceptions, prints an error message, and returns (0, 0) in case of failure.
         """
         try:
-            web_data = self.fetcher.fetch_macos_versions()
-            current_versions, current_data = self.db.get_macos_vers()
-            
-            dt_add = []
-            dt_update = []
-            now = datetime.datetime.now().isoformat()
-            
-            for version, date in web_data["Version_dict"].items():
-                if version in current_versions:
-                    pass
-                else:
-                    dt_add.append((version, date.isoformat() if hasattr(date, 'isoformat') else str(date), now))
-            
-            if dt_add or dt_update:
-                self.db.add_macos_versions(dt_add, dt_update)
-            
-            return len(dt_add), len(dt_update)
+            if web_data is None:
+                self._set_deadline(None)
+                web_data = self.fetcher.fetch_macos_versions()
+            current_data = self.db.get_macos_vers()[1]
+            # Stored rows may carry a device picked at random by older versions, so match on
+            # the macOS version alone and keep whatever device is already stored for it.
+            stored = {system.rsplit(" ", 1)[-1]: system for system, _, _ in current_data}
+            fetched = ((stored.get(system.rsplit(" ", 1)[-1], system), date)
+                       for system, date in web_data["Version_dict"].items())
+            return self._apply_versions("macos_versions", current_data, fetched)
             
         except Exception as e:
             print(f"Mac update error: {e}")
             return 0, 0
     
-    def update_all(self):
-        print("All versions are being updated...")
-        
-        self.update_platforms()
-        self.update_version_types()
-        
-        results = {}
-        
-        results['Chrome'] = self.update_chrome()
-        results['Firefox'] = self.update_firefox()
-        results['Opera'] = self.update_opera()
-        
-        results['Android'] = self.update_android()
-        results["Mac"] = self.update_mac()
-        results['Windows'] = self.update_windows()
-        results['Linux'] = self.update_linux()
-        
+    def _sources(self) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Returns the web sources as {name: (fetch, apply)}: `fetch()` downloads and parses a
+        source (safe to run concurrently), `apply(web_data)` writes the result to the database.
+        """
+        return {
+            'Chrome': (self.fetcher.fetch_chrome_versions, self.update_chrome),
+            'Firefox': (self.fetcher.fetch_firefox_versions, self.update_firefox),
+            'Opera': (partial(self.fetcher.fetch_opera_versions, since_major=self.db.get_max_major("opera")),
+                      self.update_opera),
+            'Android': (self.fetcher.fetch_android_versions, self.update_android),
+            'Mac': (self.fetcher.fetch_macos_versions, self.update_mac),
+        }
+    
+    @staticmethod
+    def _print_results(results: Dict[str, Tuple[int, int]]):
         print("\nUpdate Results:")
         print("-" * 40)
         total_added = 0
@@ -355,7 +357,79 @@ class VersionUpdater:
         
         print("-" * 40)
         print(f"  Total: +{total_added} added, {total_updated} updated")
+    
+    def _set_deadline(self, seconds: Optional[float]):
+        # Every run sets its own deadline, so one left armed for the stragglers of a
+        # timed-out `update_all` cannot fail later, unrelated updates.
+        client = getattr(self.fetcher, "client", None)
+        if client is not None:
+            client.set_deadline(seconds)
+        return client
+    
+    @staticmethod
+    def _timed_fetch(name: str, fetch):
+        with metrics.timer("source_fetch_seconds", source=name):
+            return fetch()
+    
+    @staticmethod
+    def _timed_apply(name: str, apply, web_data) -> Tuple[int, int]:
+        with metrics.timer("source_apply_seconds", source=name):
+            return apply(web_data)
+    
+    def update_all(self, workers: int = 4, timeout: float = 300.0):
+        """
+        Updates every source and prints a summary table.
+        The network-bound fetches run concurrently on a pool of `workers` threads (the
+        fetcher's `HttpClient` keeps each host's load polite), so the wall time is roughly
+        that of the slowest source. Results are written to the database as they arrive,
+        by this thread only. The whole update is bounded by `timeout`: the HTTP client's
+        deadline stops requests and retries in flight, and sources that have not finished
+        by then are reported as errors.
+        Args:
+            workers (int, optional): Number of sources fetched concurrently. Defaults to 4.
+            timeout (float, optional): Upper bound in seconds for all fetches. Defaults to 300.
+        Returns:
+            Dict[str, Tuple[int, int]]: (added, updated) for each source.
+        """
+        print("All versions are being updated...")
+        
+        self.update_platforms()
+        self.update_version_types()
+        
+        sources = self._sources()
+        # Keep the summary in the usual order whatever finishes first.
+        results = {name: (0, 0) for name in list(sources) + ['Windows', 'Linux']}
+        
+        client = self._set_deadline(timeout)
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        pending = set(sources)
+        try:
+            futures = {pool.submit(self._timed_fetch, name, fetch): name for name, (fetch, _) in sources.items()}
+            
+            results['Windows'] = self.update_windows()
+            results['Linux'] = self.update_linux()
+            
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    name = futures[future]
+                    pending.discard(name)
+                    try:
+                        web_data = future.result()
+                    except Exception as e:
+                        print(f"{name} update error: {e}")
+                        continue
+                    results[name] = self._timed_apply(name, sources[name][1], web_data)
+            except FuturesTimeoutError:
+                for name in pending:
+                    print(f"{name} update error: timed out after {timeout:g}s")
+        finally:
+            # Do not wait for stragglers; the client deadline (left armed while any
+            # remain, until the next update sets its own) makes them give up shortly.
+            pool.shutdown(wait=False, cancel_futures=True)
+            if client is not None and not pending:
+                client.set_deadline(None)
         
+        self._print_results(results)
         return results
     
     def initialize_database(self):
@@ -0,0 +1,69 @@
+import datetime
+import re
+from typing import Optional, Tuple
+
+_ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+_SHORT_DATE = re.compile(r"^(\d{2})-(\d{2})-(\d{2})\b")
+_VERSION_NUMBER = re.compile(r"(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?")
+
+
+def parse_release_date(value) -> Optional[datetime.date]:
+    """
+    Parses the release dates stored by the different fetchers into a date.
+    Handles chromedriver timestamps ("2022-03-04T05:30:52.112Z"), ISO timestamps and
+    dates written by the updater ("2023-12-01", "2026-02-04T14:20:00.986266"), and the
+    two-digit-year fragments scraped from Opera changelogs ("19-06-14", sometimes with
+    trailing text).
+    Args:
+        value: A date string, `datetime.date`/`datetime.datetime`, or None.
+    Returns:
+        Optional[datetime.date]: The parsed date, or None if it cannot be parsed.
+    Example:
+        >>> parse_release_date("19-06-14")
+        datetime.date(2019, 6, 14)
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+
+    text = str(value).strip()
+    match = _ISO_DATE.match(text)
+    year_offset = 0
+    if match is None:
+        match = _SHORT_DATE.match(text)
+        year_offset = 2000
+    if match is None:
+        return None
+
+    year, month, day = (int(part) for part in match.groups())
+    try:
+        return datetime.date(year + year_offset, month, day)
+    except ValueError:
+        return None
+
+
+def parse_version_components(version: str) -> Tuple[Optional[int], ...]:
+    """
+    Extracts the numeric (major, minor, build, patch) components of a stored version.
+    The first dotted number in the string is used, so browser tokens ("Chrome/120.0.6099.109",
+    "Firefox/147.0.1"), bare Opera versions ("95.0.4635.46") and system strings
+    ("Windows NT 10.0", "Linux; Android 12", "Macintosh; Intel Mac OS X 10.15.7") all parse.
+    Args:
+        version (str): The stored version string.
+    Returns:
+        Tuple[Optional[int], ...]: Four components; missing ones are None.
+    Example:
+        >>> parse_version_components("Firefox/147.0.1")
+        (147, 0, 1, None)
+    """
+    match = _VERSION_NUMBER.search(version or "")
+    if match is None:
+        return (None, None, None, None)
+    major, minor, build, patch = match.groups()
+    return (int(major),
+            None if minor is None else int(minor),
+            None if build is None else int(build),
+            None if patch is None else int(patch))
@@ -2,7 +2,7 @@ import string
 import random
 from typing import List
 
-def save_useragents_to_file(useragents: List[str], filename: str = None):
+def save_useragents_to_file(useragents: List[str], filename: str = None, rng: random.Random = None):
     """
     Save a list of user agents to a text file.
     Args:
@@ -10,6 +10,8 @@ def save_useragents_to_file(useragents: List[str], filename: str = None):
         filename (str, optional): The name of the file to save to. If None, a random filename
                                   with format "user_agent_<12_digits>.txt" will be generated.
                                   Defaults to None.
+        rng (random.Random, optional): RNG used for the random filename. Defaults to a new,
+                                  unseeded one.
     Returns:
         str: The filename where the user agents were saved.
     Example:
@@ -21,7 +23,8 @@ def save_useragents_to_file(useragents: List[str], filename: str = None):
     """
 
     if filename is None:
-        random_str = ''.join(random.choices(string.digits, k=12))
+        rng = rng or random.Random()
+        random_str = ''.join(rng.choices(string.digits, k=12))
         filename = f"user_agent_{random_str}.txt"
     
     with open(filename, "w", encoding="UTF-8") as file: